@@ -0,0 +1,64 @@
+"""
+ASCII Output
+============
+ASCII-only stdout for the UI check scripts, for logs that cannot show emoji
+or accented text. Set ASCII_ONLY=1 and call install() once at start-up.
+"""
+
+import os
+import re
+import sys
+import unicodedata
+
+ASCII_ONLY = bool(os.environ.get('ASCII_ONLY'))
+
+# Symbols the reports use that have a readable ASCII spelling; emoji and any
+# other non-ASCII symbol are dropped
+_ASCII_TABLE = str.maketrans({
+    '→': '->',
+    '←': '<-',
+    '•': '*',
+    '…': '...',
+    '–': '-',
+    '—': '-',
+    '×': 'x',
+    '‘': "'",
+    '’': "'",
+    '“': '"',
+    '”': '"',
+})
+
+# Emoji and pictographs (with joiners and variation selectors), plus the space
+# that separates them from the text, so "✅ Done" becomes "Done"
+_SYMBOL_RUN_RE = re.compile('[\u2190-\u2bff\u200d\ufe0f\U0001f000-\U0001faff]+ ?')
+
+
+def to_ascii(text):
+    """Return text with accents folded and every other non-ASCII character removed."""
+    if text.isascii():
+        return text
+    text = _SYMBOL_RUN_RE.sub('', text.translate(_ASCII_TABLE))
+    text = unicodedata.normalize('NFKD', text)
+    return text.encode('ascii', 'ignore').decode('ascii')
+
+
+class _AsciiWriter:
+    """Text stream wrapper passing everything written through to_ascii."""
+    
+    def __init__(self, stream):
+        self._stream = stream
+    
+    def write(self, text):
+        return self._stream.write(to_ascii(text))
+    
+    def writelines(self, lines):
+        self._stream.writelines(map(to_ascii, lines))
+    
+    def __getattr__(self, name):
+        return getattr(self._stream, name)
+
+
+def install():
+    """Route sys.stdout through to_ascii if ASCII_ONLY is set."""
+    if ASCII_ONLY and not isinstance(sys.stdout, _AsciiWriter):
+        sys.stdout = _AsciiWriter(sys.stdout)
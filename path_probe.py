@@ -0,0 +1,23 @@
+"""
+Path Probe
+==========
+Time-bounded directory checks for the cache/persistence check scripts, so a
+stored path on an unmounted or unresponsive volume cannot stall them.
+"""
+
+import os
+import threading
+
+
+def exists_fast(path, timeout=0.5):
+    """Bounded-time isdir(): a volume that does not answer within timeout counts as missing."""
+    result = []
+    
+    def probe_dir():
+        result.append(os.path.isdir(path))
+    
+    probe = threading.Thread(target=probe_dir, daemon=True)
+    probe.start()
+    probe.join(timeout)
+    # A daemon thread still blocked in stat() is abandoned and does not hold up exit
+    return bool(result) and result[0]
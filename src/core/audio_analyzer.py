@@ -99,6 +99,9 @@ class AudioAnalyzer:
         'D#m': '2A', 'Bbm': '3A', 'Fm': '4A', 'Cm': '5A', 'Gm': '6A', 'Dm': '7A'
     }
     
+    # Reverse lookup (Camelot code -> key name), built once at class creation
+    CAMELOT_TO_KEY = {camelot: key for key, camelot in CAMELOT_KEYS.items()}
+    
     # Energy level thresholds (based on DJ best practices)
     ENERGY_THRESHOLDS = {
         'low': 0.3,      # Chill, ambient, intro tracks
@@ -10,8 +10,17 @@ Developed by BlueSystemIO
 
 import os
 import logging
-from pathlib import Path
-from typing import List, Set
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+
+@dataclass
+class ScanResult:
+    """Everything collected in one traversal of a library directory."""
+    
+    audio_files: List[str] = field(default_factory=list)
+    playlist_files: List[str] = field(default_factory=list)
+    total_size_bytes: int = 0
 
 
 class LibraryScanner:
@@ -32,9 +41,129 @@ class LibraryScanner:
         '.m3u', '.m3u8', '.pls', '.cue', '.nml', '.xml'
     }
     
-    def __init__(self):
-        """Initialize the library scanner."""
+    # Number of library roots whose scan results are kept
+    SCAN_CACHE_SIZE = 32
+    
+    def __init__(self, cache_scans: bool = False):
+        """
+        Initialize the library scanner.
+        
+        Args:
+            cache_scans: Reuse scan results while directory mtimes are unchanged
+                (see scan_directory); off by default
+        """
         self.logger = logging.getLogger(__name__)
+        self.cache_scans = cache_scans
+        # root -> (mtime_ns of every directory visited, scan result)
+        self._scan_cache: Dict[str, Tuple[Dict[str, Optional[int]], ScanResult]] = {}
+    
+    def _iter_files(self, library_path: str,
+                    dir_mtimes: Optional[Dict[str, Optional[int]]] = None) -> Iterator[os.DirEntry]:
+        """
+        Yield every file entry below library_path.
+        
+        Uses os.scandir directly: DirEntry carries the file type from the
+        directory listing, so no extra stat call is made per entry. Like
+        os.walk, symlinked directories are not followed and unreadable
+        subdirectories are skipped; an unreadable root raises OSError.
+        
+        If dir_mtimes is given, it is filled with the modification time of
+        each directory listed (None where the directory could not be stat'ed).
+        """
+        stack = [library_path]
+        while stack:
+            directory = stack.pop()
+            if dir_mtimes is not None:
+                try:
+                    dir_mtimes[directory] = os.stat(directory).st_mtime_ns
+                except OSError:
+                    dir_mtimes[directory] = None
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                        elif entry.is_file():
+                            yield entry
+            except OSError as e:
+                if directory == library_path:
+                    raise
+                self.logger.warning(f"Skipping unreadable directory {directory}: {e}")
+    
+    def scan_directory(self, library_path: str) -> ScanResult:
+        """
+        Collect audio files, playlists and audio size in a single traversal.
+        
+        With cache_scans enabled, results are cached per root. A cached result
+        is reused while no directory in the tree has changed mtime, which costs
+        one stat per directory instead of a full listing. Directory mtimes miss
+        size-only changes to existing files, and on coarse-mtime filesystems
+        (FAT, HFS+, some network mounts) files added or removed within the
+        same timestamp tick; call invalidate() after such external changes.
+        
+        Args:
+            library_path: Path to scan recursively
+            
+        Returns:
+            ScanResult for the directory (shared with the cache when cache_scans
+            is enabled; do not modify)
+            
+        Raises:
+            OSError: If library_path itself cannot be listed
+        """
+        if self.cache_scans:
+            cached = self._scan_cache.get(library_path)
+            if cached is not None and self._directories_unchanged(cached[0]):
+                return cached[1]
+        
+        result = ScanResult()
+        dir_mtimes: Optional[Dict[str, Optional[int]]] = {} if self.cache_scans else None
+        audio_extensions = self.AUDIO_EXTENSIONS
+        playlist_extensions = self.PLAYLIST_EXTENSIONS
+        
+        for entry in self._iter_files(library_path, dir_mtimes):
+            # splitext, not Path.suffix: no Path per file, and a hidden file
+            # such as ".mp3" still has no extension
+            ext = os.path.splitext(entry.name)[1].lower()
+            if ext in audio_extensions:
+                result.audio_files.append(entry.path)
+                try:
+                    result.total_size_bytes += entry.stat().st_size
+                except OSError:
+                    pass
+            elif ext in playlist_extensions:
+                result.playlist_files.append(entry.path)
+        
+        if self.cache_scans:
+            self._scan_cache.pop(library_path, None)
+            if None not in dir_mtimes.values():
+                if len(self._scan_cache) >= self.SCAN_CACHE_SIZE:
+                    # Dicts keep insertion order, so the first key is the oldest scan
+                    del self._scan_cache[next(iter(self._scan_cache))]
+                self._scan_cache[library_path] = (dir_mtimes, result)
+        
+        return result
+    
+    def invalidate(self, library_path: Optional[str] = None) -> None:
+        """
+        Drop cached scan results.
+        
+        Args:
+            library_path: Root to forget, or None to clear every cached root
+        """
+        if library_path is None:
+            self._scan_cache.clear()
+        else:
+            self._scan_cache.pop(library_path, None)
+    
+    @staticmethod
+    def _directories_unchanged(dir_mtimes: Dict[str, Optional[int]]) -> bool:
+        """Check that every directory of a cached scan still has its recorded mtime."""
+        try:
+            return all(os.stat(directory).st_mtime_ns == mtime
+                       for directory, mtime in dir_mtimes.items())
+        except OSError:
+            return False
     
     def find_audio_files(self, library_path: str) -> List[str]:
         """
@@ -47,14 +176,9 @@ class LibraryScanner:
             List of audio file paths
         """
         self.logger.info(f"Scanning for audio files in: {library_path}")
-        audio_files = []
         
         try:
-            for root, dirs, files in os.walk(library_path):
-                for file in files:
-                    if Path(file).suffix.lower() in self.AUDIO_EXTENSIONS:
-                        audio_files.append(os.path.join(root, file))
-            
+            audio_files = list(self.scan_directory(library_path).audio_files)
             self.logger.info(f"Found {len(audio_files)} audio files")
             return audio_files
             
@@ -72,15 +196,8 @@ class LibraryScanner:
         Returns:
             List of playlist file paths
         """
-        playlist_files = []
-        
         try:
-            for root, dirs, files in os.walk(library_path):
-                for file in files:
-                    if Path(file).suffix.lower() in self.PLAYLIST_EXTENSIONS:
-                        playlist_files.append(os.path.join(root, file))
-            
-            return playlist_files
+            return list(self.scan_directory(library_path).playlist_files)
             
         except Exception as e:
             self.logger.error(f"Error scanning for playlists in {library_path}: {e}")
@@ -97,19 +214,17 @@ class LibraryScanner:
             Dictionary with directory statistics
         """
         try:
-            audio_files = self.find_audio_files(library_path)
-            playlist_files = self.find_playlist_files(library_path)
-            
-            total_size = 0
-            for file_path in audio_files:
-                try:
-                    total_size += Path(file_path).stat().st_size
-                except OSError:
-                    pass
+            try:
+                scan = self.scan_directory(library_path)
+            except OSError as e:
+                # An unreadable directory reports zero counts, not an empty dict
+                self.logger.error(f"Error scanning directory {library_path}: {e}")
+                scan = ScanResult()
+            total_size = scan.total_size_bytes
             
             return {
-                'total_audio_files': len(audio_files),
-                'total_playlist_files': len(playlist_files),
+                'total_audio_files': len(scan.audio_files),
+                'total_playlist_files': len(scan.playlist_files),
                 'total_size_bytes': total_size,
                 'total_size_mb': total_size // (1024 * 1024),
                 'directory_path': library_path
@@ -129,7 +244,7 @@ class LibraryScanner:
         Returns:
             True if the file is a supported audio format
         """
-        return Path(file_path).suffix.lower() in self.AUDIO_EXTENSIONS
+        return os.path.splitext(os.fspath(file_path))[1].lower() in self.AUDIO_EXTENSIONS
     
     def is_playlist_file(self, file_path: str) -> bool:
         """
@@ -141,4 +256,4 @@ class LibraryScanner:
         Returns:
             True if the file is a supported playlist format
         """
-        return Path(file_path).suffix.lower() in self.PLAYLIST_EXTENSIONS
+        return os.path.splitext(os.fspath(file_path))[1].lower() in self.PLAYLIST_EXTENSIONS
@@ -10,8 +10,60 @@ Developed by BlueSystemIO
 
 import os
 import re
+from functools import lru_cache
 from pathlib import Path
-from typing import Union, List
+from typing import Union, List, Optional
+
+
+# Shell metacharacters rejected anywhere in a path
+_DANGEROUS_CHARS_RE = re.compile(r"[|;&$<>`]")
+
+# A '..' component, with either separator so Windows-style paths are caught too
+_TRAVERSAL_RE = re.compile(r"(?:^|[\\/])\.\.(?:[\\/]|$)")
+
+# The same traversal with the dots or the separator percent-encoded
+_ENCODED_TRAVERSAL_RE = re.compile(r"%2e%2e(?:%2f|%5c|[\\/]|$)|\.\.(?:%2f|%5c)", re.IGNORECASE)
+
+# The three path checks above joined into one regex, so a path is scanned once;
+# only a rejected path is rescanned to tell which check it failed
+_PATH_THREAT_RE = re.compile('|'.join(
+    f"(?i:{pattern.pattern})" if pattern.flags & re.IGNORECASE else f"(?:{pattern.pattern})"
+    for pattern in (_DANGEROUS_CHARS_RE, _TRAVERSAL_RE, _ENCODED_TRAVERSAL_RE)
+))
+
+# Anything sanitize_filename does not keep verbatim
+_UNSAFE_FILENAME_CHARS_RE = re.compile(r"[^a-zA-Z0-9\s\.\-_]")
+
+# The same rule as a translate() table for ASCII names, derived from the regex
+_UNSAFE_ASCII_TABLE = str.maketrans({
+    char: '_' for char in map(chr, range(128)) if _UNSAFE_FILENAME_CHARS_RE.match(char)
+})
+
+# Lower-case system directories no file operation may target, each ending in '/'
+_SYSTEM_DIR_PREFIXES = (
+    '/bin/', '/sbin/', '/usr/bin/', '/usr/sbin/', '/etc/', '/boot/',
+    '/system/', '/windows/',
+)
+
+# Device names Windows reserves, with or without an extension
+_RESERVED_NAMES = frozenset({
+    'CON', 'PRN', 'AUX', 'NUL',
+    *(f'COM{i}' for i in range(1, 10)),
+    *(f'LPT{i}' for i in range(1, 10)),
+})
+
+# Parameters matching any of these (case-insensitively) are rejected as SQL injection:
+# SQL keywords, comment markers, OR/AND followed by two '=', a quote followed by a
+# stacked DROP/DELETE/UNION, and a quote closed before OR/AND and a comparison (the
+# "1' OR '1'='1" tautology; a quote before OR/AND alone, as in titles, is fine).
+# Joined into one regex so each parameter is scanned once.
+_SQL_INJECTION_RE = re.compile('|'.join(f"(?:{pattern})" for pattern in (
+    r"(\bUNION\b|\bSELECT\b|\bINSERT\b|\bUPDATE\b|\bDELETE\b|\bDROP\b|\bCREATE\b)",
+    r"(--|#|/\*|\*/)",
+    r"(\bOR\b|\bAND\b).*?=.*?=",
+    r"['\"];?\s*(\bDROP\b|\bDELETE\b|\bUNION\b)",
+    r"['\"]\s*(\bOR\b|\bAND\b)\s.*=",
+)), re.IGNORECASE)
 
 
 class SecurityError(Exception):
@@ -33,51 +85,78 @@ def validate_file_path(file_path: Union[str, Path], allowed_base_paths: List[str
     Raises:
         SecurityError: If path is invalid or contains security risks
     """
+    # All checks work on strings; the Path is only built for the caller
+    return Path(_validated_path_str(file_path, allowed_base_paths))
+
+
+def _validated_path_str(file_path: Union[str, Path], allowed_base_paths: Optional[List[str]]) -> str:
+    """Body of validate_file_path, returning the canonical path as a string."""
     if not file_path:
         raise SecurityError("Empty file path provided")
     
-    # Convert to Path object
+    # Take the string form once; every check below works on it
     try:
-        path = Path(file_path)
-    except (TypeError, ValueError) as e:
+        path_str = os.fspath(file_path)
+    except TypeError as e:
         raise SecurityError(f"Invalid path format: {e}")
+    if not isinstance(path_str, str):
+        raise SecurityError(f"Invalid path format: expected str, got {type(path_str).__name__}")
     
-    # Check for null bytes (common in path traversal attacks)
-    if '\0' in str(file_path):
+    # Null bytes (common in path traversal attacks) are the cheapest reject, so go first
+    if '\0' in path_str:
         raise SecurityError("Path contains null bytes")
     
-    # Check for dangerous characters
-    dangerous_chars = ['|', ';', '&', '$', '>', '<', '`']
-    if any(char in str(file_path) for char in dangerous_chars):
-        raise SecurityError(f"Path contains dangerous characters: {file_path}")
+    # One scan covers dangerous characters and (encoded) traversal; only a
+    # rejected path pays for finding out which check it failed
+    if _PATH_THREAT_RE.search(path_str):
+        if _DANGEROUS_CHARS_RE.search(path_str):
+            raise SecurityError(f"Path contains dangerous characters: {file_path}")
+        raise SecurityError("Path traversal detected (..) in path")
     
-    # Resolve path to handle .. and . components
+    # Canonicalize once: absolute, symlinks resolved, no . components
     try:
-        resolved_path = path.resolve()
-    except (OSError, RuntimeError) as e:
+        resolved_str = _canon(path_str)
+    except (OSError, ValueError) as e:
         raise SecurityError(f"Cannot resolve path: {e}")
     
-    # Check for path traversal attempts
-    if '..' in path.parts:
-        raise SecurityError("Path traversal detected (..) in path")
-    
-    # If allowed base paths are specified, ensure path is within them
+    # If allowed base paths are specified, the canonical path must lie inside one.
+    # Bases carry a trailing separator so /music does not admit /music2
     if allowed_base_paths:
-        path_str = str(resolved_path)
-        allowed = False
+        canonical_bases = []
         for base_path in allowed_base_paths:
             try:
-                base_resolved = Path(base_path).resolve()
-                if path_str.startswith(str(base_resolved)):
-                    allowed = True
-                    break
-            except (OSError, RuntimeError):
+                canonical_bases.append(os.path.join(_canon(os.fspath(base_path)), ''))
+            except (OSError, ValueError):
                 continue
         
-        if not allowed:
+        if not (resolved_str + os.sep).startswith(tuple(canonical_bases)):
             raise SecurityError(f"Path outside allowed directories: {file_path}")
     
-    return resolved_path
+    return resolved_str
+
+
+def _canon(path_str: str) -> str:
+    """
+    os.path.realpath() memoized per path.
+    
+    Shared by path validation, base containment and is_safe_file_operation,
+    so each distinct path costs its lstat/readlink syscalls once. A symlink
+    changed afterwards is not noticed until clear_path_cache() is called.
+    """
+    # realpath() of a relative path depends on the working directory
+    cwd = None if os.path.isabs(path_str) else os.getcwd()
+    return _realpath_cached(path_str, cwd)
+
+
+@lru_cache(maxsize=65536)
+def _realpath_cached(path_str: str, cwd: Optional[str]) -> str:
+    # cwd is only part of the cache key
+    return os.path.realpath(path_str)
+
+
+def clear_path_cache():
+    """Forget all memoized canonical paths, e.g. before scanning a library again."""
+    _realpath_cached.cache_clear()
 
 
 def sanitize_filename(filename: str) -> str:
@@ -95,23 +174,20 @@ def sanitize_filename(filename: str) -> str:
     
     # Remove or replace dangerous characters
     # Keep alphanumeric, spaces, dots, hyphens, underscores
-    sanitized = re.sub(r'[^a-zA-Z0-9\s\.\-_]', '_', filename)
+    if filename.isascii():
+        sanitized = filename.translate(_UNSAFE_ASCII_TABLE)
+    else:
+        sanitized = _UNSAFE_FILENAME_CHARS_RE.sub('_', filename)
     
     # Remove leading/trailing dots and spaces
     sanitized = sanitized.strip('. ')
     
-    # Ensure filename is not empty after sanitization
-    if not sanitized:
+    # Ensure filename is not empty (or only placeholders) after sanitization
+    if not sanitized.strip('_'):
         raise SecurityError("Filename becomes empty after sanitization")
     
-    # Check for reserved Windows filenames
-    reserved_names = {
-        'CON', 'PRN', 'AUX', 'NUL',
-        'COM1', 'COM2', 'COM3', 'COM4', 'COM5', 'COM6', 'COM7', 'COM8', 'COM9',
-        'LPT1', 'LPT2', 'LPT3', 'LPT4', 'LPT5', 'LPT6', 'LPT7', 'LPT8', 'LPT9'
-    }
-    
-    if sanitized.upper() in reserved_names:
+    # Check for reserved Windows filenames (reserved with any extension, e.g. CON.mp3)
+    if sanitized.split('.', 1)[0].upper() in _RESERVED_NAMES:
         sanitized = f"_{sanitized}"
     
     return sanitized
@@ -139,19 +215,8 @@ def validate_database_query_params(params: tuple) -> tuple:
             validated_params.append(None)
         elif isinstance(param, (str, int, float, bool)):
             # Check string parameters for SQL injection patterns
-            if isinstance(param, str):
-                # Basic SQL injection detection
-                dangerous_patterns = [
-                    r"(\bUNION\b|\bSELECT\b|\bINSERT\b|\bUPDATE\b|\bDELETE\b|\bDROP\b|\bCREATE\b)",
-                    r"(--|#|/\*|\*/)",
-                    r"(\bOR\b|\bAND\b).*?=.*?=",
-                    r"['\"];?\s*(\bDROP\b|\bDELETE\b|\bUNION\b)"
-                ]
-                
-                param_upper = param.upper()
-                for pattern in dangerous_patterns:
-                    if re.search(pattern, param_upper, re.IGNORECASE):
-                        raise SecurityError(f"Potential SQL injection detected in parameter: {param}")
+            if isinstance(param, str) and _SQL_INJECTION_RE.search(param.upper()):
+                raise SecurityError(f"Potential SQL injection detected in parameter: {param}")
             
             validated_params.append(param)
         else:
@@ -175,20 +240,17 @@ def is_safe_file_operation(source_path: Union[str, Path], target_path: Union[str
         SecurityError: If operation is unsafe
     """
     try:
-        # Validate both paths
-        safe_source = validate_file_path(source_path)
-        safe_target = validate_file_path(target_path)
-        
-        # Check that we're not overwriting system files
-        system_paths = ['/bin', '/sbin', '/usr/bin', '/usr/sbin', '/system', '/windows']
-        target_str = str(safe_target).lower()
+        # Validate both paths (canonical strings; no Path objects needed here)
+        safe_source = _validated_path_str(source_path, None)
+        safe_target = _validated_path_str(target_path, None)
         
-        for sys_path in system_paths:
-            if target_str.startswith(sys_path.lower()):
-                raise SecurityError(f"Cannot write to system directory: {target_path}")
+        # Check that we're not overwriting system files; the appended separator
+        # lets a prefix match the directory itself but not e.g. /binaries
+        if (safe_target.lower() + '/').startswith(_SYSTEM_DIR_PREFIXES):
+            raise SecurityError(f"Cannot write to system directory: {target_path}")
         
-        # Check that source and target are not the same
-        if safe_source == safe_target:
+        # Check that source and target are not the same (normcase: as Path equality would)
+        if os.path.normcase(safe_source) == os.path.normcase(safe_target):
             raise SecurityError("Source and target paths are identical")
         
         return True
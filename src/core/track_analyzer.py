@@ -8,20 +8,28 @@ Part of the SOLID refactoring of FileOrganizer.
 Developed by BlueSystemIO
 """
 
+import itertools
 import logging
+import multiprocessing
+import numbers
+import os
 import time
-from pathlib import Path
-from typing import Dict, Any, Optional
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Any, List, Optional
 from dataclasses import dataclass
 
+import numpy as np
+
 from .mixinkey_integration import MixInKeyIntegration, MixInKeyTrackData
 from .genre_classifier import GenreClassifier, GenreClassificationResult
 from .audio_analyzer import AudioAnalyzer, AudioAnalysisResult
+from .security_utils import clear_path_cache
 
 
-@dataclass
+@dataclass(slots=True)
 class TrackData:
-    """Complete track data combining all analysis results."""
+    """Complete track data combining all analysis results (slotted: one per file)."""
     file_path: str
     mixinkey_data: Optional[MixInKeyTrackData] = None
     genre_classification: Optional[GenreClassificationResult] = None
@@ -29,6 +37,201 @@ class TrackData:
     processed_timestamp: Optional[float] = None
 
 
+# energy_level for each MixIn Key energy rating, indexed by the rating (0-10)
+_ENERGY_LEVELS = tuple(i / 10 for i in range(11))
+
+
+# Source of TrackDatabase versions; unique across all instances
+_database_versions = itertools.count(1)
+
+
+def _genre_of(track_data: TrackData) -> Optional[str]:
+    """Primary genre of a track, or None if it has not been classified."""
+    genre_classification = track_data.genre_classification
+    if genre_classification and genre_classification.primary_genre:
+        return genre_classification.primary_genre
+    return None
+
+
+def _key_of(track_data: TrackData) -> Optional[str]:
+    """Musical key of a track, or None if it is unknown."""
+    mixinkey_data = track_data.mixinkey_data
+    if mixinkey_data and mixinkey_data.key:
+        return mixinkey_data.key
+    return None
+
+
+def _bpm_of(track_data: TrackData) -> Optional[float]:
+    """BPM of a track, or None if it is unknown (missing, zero or not a number)."""
+    mixinkey_data = track_data.mixinkey_data
+    if mixinkey_data and mixinkey_data.bpm and isinstance(mixinkey_data.bpm, numbers.Real):
+        return mixinkey_data.bpm
+    return None
+
+
+def _bpm_column(tracks: Dict[str, TrackData]) -> np.ndarray:
+    """BPM of every track as float64, in database order, NaN where unknown."""
+    return np.fromiter(
+        (np.nan if bpm is None else bpm for bpm in map(_bpm_of, tracks.values())),
+        dtype=np.float64, count=len(tracks)
+    )
+
+
+def _analyzed_by_mixinkey(track_data: TrackData) -> bool:
+    """Whether the track's data came from MixIn Key rather than our own analysis."""
+    mixinkey_data = track_data.mixinkey_data
+    return bool(mixinkey_data and mixinkey_data.analyzed_by_mixinkey)
+
+
+class TrackDatabase(dict):
+    """
+    Dictionary of file path -> TrackData with secondary indexes.
+    
+    by_genre and by_key map each genre / key to the paths carrying it, kept
+    in step with every insertion and removal, as are the running totals
+    behind the database statistics (bpm_total, bpm_count,
+    mixinkey_analyzed and the BPM bounds). Each change also gives the
+    database a new, globally unique version, so derived views can tell
+    whether they are stale. Modifying a stored TrackData in place is not
+    tracked; store the updated object again instead.
+    """
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__()
+        # Inner dicts are used as insertion-ordered sets of paths
+        self.by_genre: Dict[str, Dict[str, None]] = defaultdict(dict)
+        self.by_key: Dict[str, Dict[str, None]] = defaultdict(dict)
+        self._reset_totals()
+        self.version = next(_database_versions)
+        self.update(*args, **kwargs)
+    
+    def _reset_totals(self):
+        self.bpm_total = 0.0
+        self.bpm_count = 0
+        self.mixinkey_analyzed = 0
+        # (min, max) of known BPMs; None once a removal may have taken an extreme
+        self._bpm_bounds: Optional[tuple] = None
+    
+    def bpm_bounds(self) -> Optional[tuple]:
+        """(min, max) of the known BPMs, or None if no track has a BPM."""
+        if not self.bpm_count:
+            return None
+        if self._bpm_bounds is None:
+            bpms = _bpm_column(self)
+            self._bpm_bounds = (float(np.nanmin(bpms)), float(np.nanmax(bpms)))
+        return self._bpm_bounds
+    
+    def __reduce__(self):
+        # Rebuild through __init__ so the indexes exist before items are added
+        return (type(self), (dict(self),))
+    
+    def _index(self, path: str, track_data: TrackData):
+        genre = _genre_of(track_data)
+        if genre is not None:
+            self.by_genre[genre][path] = None
+        key = _key_of(track_data)
+        if key is not None:
+            self.by_key[key][path] = None
+        
+        bpm = _bpm_of(track_data)
+        if bpm is not None:
+            self.bpm_total += bpm
+            self.bpm_count += 1
+            if self.bpm_count == 1:
+                self._bpm_bounds = (bpm, bpm)
+            elif self._bpm_bounds is not None:
+                low, high = self._bpm_bounds
+                self._bpm_bounds = (min(low, bpm), max(high, bpm))
+        self.mixinkey_analyzed += _analyzed_by_mixinkey(track_data)
+        self.version = next(_database_versions)
+    
+    def _unindex(self, path: str, track_data: TrackData):
+        for index, value in ((self.by_genre, _genre_of(track_data)),
+                             (self.by_key, _key_of(track_data))):
+            if value is not None:
+                paths = index[value]
+                paths.pop(path, None)
+                if not paths:
+                    del index[value]
+        
+        bpm = _bpm_of(track_data)
+        if bpm is not None:
+            self.bpm_count -= 1
+            # Restart from an exact zero so float error cannot outlive the data
+            self.bpm_total = self.bpm_total - bpm if self.bpm_count else 0.0
+            if self._bpm_bounds is not None and bpm in self._bpm_bounds:
+                self._bpm_bounds = None
+        self.mixinkey_analyzed -= _analyzed_by_mixinkey(track_data)
+        self.version = next(_database_versions)
+    
+    def __setitem__(self, path, track_data):
+        if path in self:
+            self._unindex(path, self[path])
+        super().__setitem__(path, track_data)
+        self._index(path, track_data)
+    
+    def __delitem__(self, path):
+        track_data = self[path]
+        super().__delitem__(path)
+        self._unindex(path, track_data)
+    
+    def __ior__(self, other):
+        self.update(other)
+        return self
+    
+    def clear(self):
+        super().clear()
+        self.by_genre.clear()
+        self.by_key.clear()
+        self._reset_totals()
+        self.version = next(_database_versions)
+    
+    def pop(self, path, *default):
+        if path not in self:
+            return super().pop(path, *default)
+        track_data = super().pop(path)
+        self._unindex(path, track_data)
+        return track_data
+    
+    def popitem(self):
+        path, track_data = super().popitem()
+        self._unindex(path, track_data)
+        return path, track_data
+    
+    def setdefault(self, path, default=None):
+        if path not in self:
+            self[path] = default
+        return self[path]
+    
+    def update(self, *args, **kwargs):
+        for path, track_data in dict(*args, **kwargs).items():
+            self[path] = track_data
+
+
+@dataclass
+class _TrackColumns:
+    """Column-wise snapshot of a TrackDatabase, one array entry per track."""
+    version: int
+    paths: List[str]
+    bpm: np.ndarray  # float64, NaN where the BPM is unknown
+    bpm_order: np.ndarray  # track indices by ascending BPM, unknown BPMs last
+    sorted_bpm: np.ndarray  # bpm[bpm_order], for binary search
+    
+    @classmethod
+    def from_tracks(cls, tracks: TrackDatabase) -> '_TrackColumns':
+        """Extract the columns in a single pass over the database."""
+        bpm = _bpm_column(tracks)
+        bpm_order = np.argsort(bpm, kind='stable')
+        
+        return cls(
+            version=tracks.version,
+            paths=list(tracks),
+            bpm=bpm,
+            bpm_order=bpm_order,
+            sorted_bpm=bpm[bpm_order]
+        )
+
+
 class TrackAnalyzer:
     """
     Responsible for analyzing individual tracks and managing track database.
@@ -36,17 +239,48 @@ class TrackAnalyzer:
     Single Responsibility: Track analysis and data management
     """
     
-    def __init__(self):
-        """Initialize the track analyzer."""
+    # Smaller batches are analyzed in-process; starting workers would cost more
+    PARALLEL_MIN_FILES = 64
+    
+    def __init__(self, max_workers: Optional[int] = 1):
+        """
+        Initialize the track analyzer.
+        
+        Args:
+            max_workers: Worker processes for build_tracks_database
+                (1 = analyze serially in this process, None = auto-detect).
+                Workers analyze with their own TrackAnalyzer, not this instance's
+                components, and only for files without MixIn Key data.
+        """
         self.logger = logging.getLogger(__name__)
         
+        if max_workers is None:
+            max_workers = min(8, multiprocessing.cpu_count())
+        self.max_workers = max_workers
+        
         # Initialize analysis components
         self.mixinkey_integration = MixInKeyIntegration()
         self.genre_classifier = GenreClassifier()
         self.audio_analyzer = AudioAnalyzer()
         
-        # Track database
-        self.tracks_database: Dict[str, TrackData] = {}
+        # Track database, plus a column view rebuilt lazily after changes
+        self._tracks_database = TrackDatabase()
+        self._columns: Optional[_TrackColumns] = None
+    
+    @property
+    def tracks_database(self) -> TrackDatabase:
+        """Analyzed tracks keyed by file path."""
+        return self._tracks_database
+    
+    @tracks_database.setter
+    def tracks_database(self, tracks: Dict[str, TrackData]):
+        self._tracks_database = TrackDatabase(tracks)
+    
+    def _track_columns(self) -> _TrackColumns:
+        """Column view of the database, rebuilt only when the database changed."""
+        if self._columns is None or self._columns.version != self._tracks_database.version:
+            self._columns = _TrackColumns.from_tracks(self._tracks_database)
+        return self._columns
     
     def analyze_track(self, file_path: str, mixinkey_data: Optional[MixInKeyTrackData] = None) -> TrackData:
         """
@@ -59,7 +293,8 @@ class TrackAnalyzer:
         Returns:
             TrackData with complete analysis results
         """
-        self.logger.debug(f"Analyzing track: {file_path}")
+        # Lazy %-formatting: the message is only built when debug logging is on
+        self.logger.debug("Analyzing track: %s", file_path)
         
         track_data = TrackData(
             file_path=file_path,
@@ -93,30 +328,56 @@ class TrackAnalyzer:
         self.logger.info(f"Building tracks database for {len(audio_files)} files")
         start_time = time.time()
         
+        # Symlinks may have moved since the last build; resolve paths afresh
+        clear_path_cache()
+        
         if not mixinkey_tracks:
             mixinkey_tracks = {}
         
         processed_count = 0
         failed_count = 0
         
-        for file_path in audio_files:
-            try:
-                # Get existing MixIn Key data if available
-                mixinkey_data = mixinkey_tracks.get(file_path)
-                
-                # Analyze the track
-                track_data = self.analyze_track(file_path, mixinkey_data)
-                
-                # Store in database
-                self.tracks_database[file_path] = track_data
-                processed_count += 1
-                
-                if processed_count % 100 == 0:
-                    self.logger.info(f"Processed {processed_count}/{len(audio_files)} files")
+        executor = None
+        futures = {}
+        unanalyzed = [file_path for file_path in audio_files if not mixinkey_tracks.get(file_path)]
+        if self.max_workers > 1 and len(unanalyzed) >= self.PARALLEL_MIN_FILES:
+            # Audio analysis is CPU-bound: fan it out to worker processes up front,
+            # then collect the results below in input order. Tracks with MixIn Key
+            # data are cheap to analyze and stay in-process
+            executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            futures = {
+                file_path: executor.submit(_analyze_track_in_worker, file_path, None)
+                for file_path in unanalyzed
+            }
+        
+        def analyze(file_path: str, mixinkey_data: Optional[MixInKeyTrackData]) -> TrackData:
+            future = futures.get(file_path)
+            if future is not None:
+                return future.result()
+            return self.analyze_track(file_path, mixinkey_data)
+        
+        try:
+            for file_path in audio_files:
+                try:
+                    # Get existing MixIn Key data if available
+                    mixinkey_data = mixinkey_tracks.get(file_path)
+                    
+                    # Analyze the track
+                    track_data = analyze(file_path, mixinkey_data)
+                    
+                    # Store in database
+                    self.tracks_database[file_path] = track_data
+                    processed_count += 1
                     
-            except Exception as e:
-                self.logger.warning(f"Failed to analyze {file_path}: {e}")
-                failed_count += 1
+                    if processed_count % 100 == 0:
+                        self.logger.info(f"Processed {processed_count}/{len(audio_files)} files")
+                        
+                except Exception as e:
+                    self.logger.warning(f"Failed to analyze {file_path}: {e}")
+                    failed_count += 1
+        finally:
+            if executor is not None:
+                executor.shutdown(cancel_futures=True)
         
         processing_time = time.time() - start_time
         
@@ -124,8 +385,7 @@ class TrackAnalyzer:
             'total_files': len(audio_files),
             'processed_files': processed_count,
             'failed_files': failed_count,
-            'mixinkey_analyzed': len([t for t in self.tracks_database.values() 
-                                   if t.mixinkey_data and t.mixinkey_data.analyzed_by_mixinkey]),
+            'mixinkey_analyzed': self.tracks_database.mixinkey_analyzed,
             'processing_time': processing_time,
             'tracks_database_size': len(self.tracks_database)
         }
@@ -155,14 +415,21 @@ class TrackAnalyzer:
         Returns:
             Dictionary of tracks filtered by genre
         """
-        filtered_tracks = {}
-        
-        for file_path, track_data in self.tracks_database.items():
-            if (track_data.genre_classification and 
-                track_data.genre_classification.primary_genre == genre):
-                filtered_tracks[file_path] = track_data
+        tracks = self._tracks_database
+        return {path: tracks[path] for path in tracks.by_genre.get(genre, ())}
+    
+    def get_tracks_by_key(self, key: str) -> Dict[str, TrackData]:
+        """
+        Get all tracks in a specific key.
         
-        return filtered_tracks
+        Args:
+            key: Key to filter by (as stored in the MixIn Key data, e.g. "8A")
+            
+        Returns:
+            Dictionary of tracks filtered by key
+        """
+        tracks = self._tracks_database
+        return {path: tracks[path] for path in tracks.by_key.get(key, ())}
     
     def get_tracks_by_bpm_range(self, min_bpm: float, max_bpm: float) -> Dict[str, TrackData]:
         """
@@ -175,14 +442,17 @@ class TrackAnalyzer:
         Returns:
             Dictionary of tracks filtered by BPM range
         """
-        filtered_tracks = {}
+        columns = self._track_columns()
         
-        for file_path, track_data in self.tracks_database.items():
-            if (track_data.mixinkey_data and track_data.mixinkey_data.bpm and
-                min_bpm <= track_data.mixinkey_data.bpm <= max_bpm):
-                filtered_tracks[file_path] = track_data
+        # Two binary searches bound the range; NaN sorts last, so unknown BPMs never match
+        start = np.searchsorted(columns.sorted_bpm, min_bpm, side='left')
+        stop = np.searchsorted(columns.sorted_bpm, max_bpm, side='right')
         
-        return filtered_tracks
+        # Sorting the hits restores database order
+        matches = np.sort(columns.bpm_order[start:stop]).tolist()
+        paths = columns.paths
+        tracks = self._tracks_database
+        return {paths[i]: tracks[paths[i]] for i in matches}
     
     def get_database_statistics(self) -> Dict[str, Any]:
         """
@@ -194,35 +464,19 @@ class TrackAnalyzer:
         if not self.tracks_database:
             return {}
         
-        total_tracks = len(self.tracks_database)
-        mixinkey_analyzed = len([t for t in self.tracks_database.values() 
-                               if t.mixinkey_data and t.mixinkey_data.analyzed_by_mixinkey])
+        tracks = self._tracks_database
         
-        # Collect statistics
-        genres = {}
-        bpms = []
-        keys = {}
-        
-        for track_data in self.tracks_database.values():
-            # Genre distribution
-            if track_data.genre_classification and track_data.genre_classification.primary_genre:
-                genre = track_data.genre_classification.primary_genre
-                genres[genre] = genres.get(genre, 0) + 1
-            
-            # BPM and key data
-            if track_data.mixinkey_data:
-                if track_data.mixinkey_data.bpm:
-                    bpms.append(track_data.mixinkey_data.bpm)
-                if track_data.mixinkey_data.key:
-                    key = track_data.mixinkey_data.key
-                    keys[key] = keys.get(key, 0) + 1
+        # Everything below is read from totals and indexes kept up to date on insert
+        genres = {genre: len(paths) for genre, paths in tracks.by_genre.items()}
+        keys = {key: len(paths) for key, paths in tracks.by_key.items()}
+        bpm_bounds = tracks.bpm_bounds()
         
         return {
-            'total_tracks': total_tracks,
-            'mixinkey_analyzed': mixinkey_analyzed,
+            'total_tracks': len(tracks),
+            'mixinkey_analyzed': tracks.mixinkey_analyzed,
             'genre_distribution': genres,
-            'average_bpm': sum(bpms) / len(bpms) if bpms else 0,
-            'bpm_range': {'min': min(bpms), 'max': max(bpms)} if bpms else None,
+            'average_bpm': tracks.bpm_total / tracks.bpm_count if tracks.bpm_count else 0,
+            'bpm_range': {'min': bpm_bounds[0], 'max': bpm_bounds[1]} if bpm_bounds else None,
             'key_distribution': keys,
             'most_common_genre': max(genres, key=genres.get) if genres else None,
             'most_common_key': max(keys, key=keys.get) if keys else None
@@ -248,10 +502,10 @@ class TrackAnalyzer:
             if analysis_result.success:
                 return MixInKeyTrackData(
                     file_path=file_path,
-                    filename=Path(file_path).name,
+                    filename=os.path.basename(file_path),
                     bpm=analysis_result.bpm,
                     key=analysis_result.key,
-                    energy=int(analysis_result.energy_level * 10) if analysis_result.energy_level else None,
+                    energy=min(10, max(1, int(analysis_result.energy_level * 10))) if analysis_result.energy_level else None,
                     duration=analysis_result.duration,
                     analyzed_by_mixinkey=False
                 )
@@ -270,12 +524,25 @@ class TrackAnalyzer:
         Returns:
             AudioAnalysisResult instance
         """
+        energy = mixinkey_data.energy
         return AudioAnalysisResult(
             file_path=mixinkey_data.file_path,
             duration=mixinkey_data.duration or 0,
             sample_rate=44100,  # Default
             bpm=mixinkey_data.bpm,
             key=mixinkey_data.key,
-            energy_level=mixinkey_data.energy / 10 if mixinkey_data.energy else None,
+            energy_level=_ENERGY_LEVELS[min(10, max(0, int(energy)))] if energy else None,
             success=True
         )
+
+
+# Analyzer reused by every task a worker process runs for build_tracks_database
+_worker_analyzer: Optional[TrackAnalyzer] = None
+
+
+def _analyze_track_in_worker(file_path: str, mixinkey_data: Optional[MixInKeyTrackData]) -> TrackData:
+    """Analyze one track inside a worker process (module-level so it can be pickled)."""
+    global _worker_analyzer
+    if _worker_analyzer is None:
+        _worker_analyzer = TrackAnalyzer(max_workers=1)
+    return _worker_analyzer.analyze_track(file_path, mixinkey_data)
@@ -9,6 +9,9 @@ import json
 import time
 from pathlib import Path
 
+from path_probe import exists_fast
+
+
 def simulate_analysis_completion():
     """Simulate a complete analysis to test cache saving."""
     print("🧪 TESTING CACHE SAVE FIX")
@@ -128,8 +131,13 @@ def test_cache_loading():
             print("⚠️  Cache is too old - would be ignored")
             return False
         
-        # In a real scenario, we'd check if path exists
-        # For testing, we'll skip path validation
+        # The mock library lives on an external volume; report its state without
+        # letting an unmounted drive block the check
+        if exists_fast(cached_path):
+            print("✅ Library path is mounted")
+        else:
+            print("📝 Library path not mounted (expected for mock data)")
+        
         print("✅ Cache is valid and loadable")
         return True
         
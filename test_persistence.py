@@ -9,6 +9,8 @@ import json
 import time
 from pathlib import Path
 
+from path_probe import exists_fast
+
 def test_cache_system():
     """Test the persistence cache system."""
     print("🔍 TESTING PERSISTENCE SYSTEM")
@@ -57,7 +59,7 @@ def test_cache_system():
             else:
                 print("✅ Cache is fresh and valid")
             
-            if Path(library_path).exists():
+            if exists_fast(library_path):
                 print("✅ Library path still exists")
             else:
                 print("❌ Library path no longer exists")
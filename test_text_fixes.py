@@ -7,88 +7,148 @@ Verificar que las mejoras de texto funcionan correctamente
 
 import sys
 import os
-from pathlib import Path
+import unicodedata
+
+import numpy as np
+
+import ascii_output
+from ui_report import advance, emit, get_fm
+
+# ASCII_ONLY=1 keeps the report to plain ASCII
+ascii_output.install()
 
 # Add src to path
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+sys.path.insert(0, os.path.dirname(__file__) + os.sep + 'src')
+
+# Precomputed rule strings
+_SEP50 = '-' * 50
+_SEP60 = '-' * 60
+_SEP50_EQ = '=' * 50
+_SEP80_EQ = '=' * 80
+
+# Improved column sizing, stored column-wise
+COLUMN_NAMES = ('File', 'Genre', 'BPM', 'Key', 'Energy', 'MixIn Key')
+OLD_WIDTHS = np.array([280, 135, 65, 45, 65, 80], dtype=np.int32)
+NEW_WIDTHS = np.array([320, 150, 70, 50, 70, 90], dtype=np.int32)
+COLUMN_SAMPLES = ('Very Long Song Name...flac', 'Progressive House/Trance', '128.45', '7A', '8', 'Analyzed')
+
+# Status labels indexed by a pass/fail bool (False -> 0, True -> 1)
+TRUNCATION_STATUS = tuple(map(sys.intern, ("⚠️ ", "✅")))
+FITS_LABELS = tuple(map(sys.intern, ("❌ No", "✅ Yes")))
+
+# Truncation test cases
+TEST_FILES = (
+    "Short.mp3",
+    "Medium Length Song Name.mp3",
+    "Very Long Song Name That Could Cause Display Issues - Artist Name (Extended Remix Version).flac",
+    "Progressive House Mix 2024 - DJ Name - Ultra Long Track Name With Many Details.wav",
+    "🎵 Unicode Song With Emojis 🎶 Very Long Name.m4a",
+    "Track_With_Underscores_And_Numbers_12345.mp3",
+)
+
+# (text type, text) pairs measured with Qt
+MEASURED_TEXTS = (
+    ("Window Title", "🎧 MusicFlow Organizer - DJ Library Management"),
+    ("Button Text", "🤖 AI Enhance"),
+    ("Long Filename", "Very Long Song Name That Could Cause Issues.mp3"),
+    ("Genre Text", "Progressive House/Trance"),
+    ("Status Text", "Successfully enhanced 15 tracks"),
+)
+
+_QT_OK = None
+_QT_ERROR = None
+
+def _try_qt():
+    """Whether Qt can be used here; the first answer (failure included) is cached."""
+    global _QT_OK, _QT_ERROR
+    if _QT_OK is None:
+        headless = (sys.platform.startswith('linux')
+                    and not os.environ.get('QT_QPA_PLATFORM')
+                    and not os.environ.get('DISPLAY')
+                    and not os.environ.get('WAYLAND_DISPLAY'))
+        if headless:
+            # Qt aborts the whole process (no exception) when no platform plugin can start
+            _QT_OK, _QT_ERROR = False, "no display available (set QT_QPA_PLATFORM=offscreen)"
+        else:
+            try:
+                get_fm()
+                _QT_OK = True
+            except Exception as e:
+                _QT_OK, _QT_ERROR = False, e
+    return _QT_OK
+
+def _extends_cluster(char):
+    """True for code points that attach to the preceding character."""
+    code = ord(char)
+    return (unicodedata.combining(char) != 0
+            or code in (0x200C, 0x200D)          # ZWNJ / ZWJ
+            or 0xFE00 <= code <= 0xFE0F          # variation selectors
+            or 0x1F3FB <= code <= 0x1F3FF)       # emoji skin-tone modifiers
+
+def _grapheme_safe_cut(text, index):
+    """Move a cut index left until it no longer splits a grapheme cluster."""
+    while 0 < index < len(text) and (_extends_cluster(text[index]) or text[index - 1] == '\u200d'):
+        index -= 1
+    return index
+
+def smart_truncate(file_name, available_width=310, avg_char_width=8):
+    """Simulate the smart truncation logic."""
+    if len(file_name) * avg_char_width <= available_width:
+        return file_name
+    
+    # rfind instead of os.path.splitext: no fspath/separator handling or tuple
+    dot = file_name.rfind('.')
+    ext = file_name[dot:] if dot > 0 else ''
+    max_name_chars = available_width // avg_char_width - len(ext) - 3
+    
+    if max_name_chars > 10:
+        return file_name[:_grapheme_safe_cut(file_name, max_name_chars)] + "..." + ext
+    return file_name[:_grapheme_safe_cut(file_name, 30)] + "..."
 
 def test_smart_truncation():
     """Test the smart file name truncation algorithm."""
     print("🔍 TESTING SMART TEXT TRUNCATION")
-    print("=" * 50)
-    
-    # Simulate the truncation logic
-    def smart_truncate(file_name, available_width=310, avg_char_width=8):
-        """Simulate the smart truncation logic."""
-        if len(file_name) * avg_char_width <= available_width:
-            return file_name
-        
-        name_part, ext = os.path.splitext(file_name)
-        max_name_chars = available_width // avg_char_width - len(ext) - 3
-        
-        if max_name_chars > 10:
-            return name_part[:max_name_chars] + "..." + ext
-        else:
-            return file_name[:30] + "..."
-    
-    # Test cases
-    test_files = [
-        "Short.mp3",
-        "Medium Length Song Name.mp3", 
-        "Very Long Song Name That Could Cause Display Issues - Artist Name (Extended Remix Version).flac",
-        "Progressive House Mix 2024 - DJ Name - Ultra Long Track Name With Many Details.wav",
-        "🎵 Unicode Song With Emojis 🎶 Very Long Name.m4a",
-        "Track_With_Underscores_And_Numbers_12345.mp3"
-    ]
+    print(_SEP50_EQ)
     
     print("Original → Truncated")
-    print("-" * 50)
+    print(_SEP50)
     
-    for file_name in test_files:
+    rows = []
+    for file_name in TEST_FILES:
         truncated = smart_truncate(file_name)
-        status = "✅" if len(truncated) <= 45 else "⚠️ "
-        print(f"{status} {file_name}")
+        status = TRUNCATION_STATUS[len(truncated) <= 45]
+        rows.append(f"{status} {file_name}")
         if file_name != truncated:
-            print(f"    → {truncated}")
-        print()
+            rows.append(f"    → {truncated}")
+        rows.append("")
+    emit(rows)
 
 def test_column_improvements():
     """Test the improved column sizing."""
     print("📋 TESTING IMPROVED COLUMN SIZING")
-    print("=" * 50)
-    
-    # New column widths
-    columns = [
-        {'name': 'File', 'old_width': 280, 'new_width': 320, 'sample': 'Very Long Song Name...flac'},
-        {'name': 'Genre', 'old_width': 135, 'new_width': 150, 'sample': 'Progressive House/Trance'},
-        {'name': 'BPM', 'old_width': 65, 'new_width': 70, 'sample': '128.45'},
-        {'name': 'Key', 'old_width': 45, 'new_width': 50, 'sample': '7A'},
-        {'name': 'Energy', 'old_width': 65, 'new_width': 70, 'sample': '8'},
-        {'name': 'MixIn Key', 'old_width': 80, 'new_width': 90, 'sample': 'Analyzed'}
-    ]
+    print(_SEP50_EQ)
     
     print(f"{'Column':<12} {'Old':<5} {'New':<5} {'Gain':<6} {'Sample Content':<25}")
-    print("-" * 60)
+    print(_SEP60)
     
-    total_old = 0
-    total_new = 0
+    gains = NEW_WIDTHS - OLD_WIDTHS
+    total_old = int(OLD_WIDTHS.sum())
+    total_new = int(NEW_WIDTHS.sum())
     
-    for col in columns:
-        gain = col['new_width'] - col['old_width']
+    rows = []
+    for name, old_width, new_width, gain, sample in zip(COLUMN_NAMES, OLD_WIDTHS, NEW_WIDTHS, gains, COLUMN_SAMPLES):
         gain_str = f"+{gain}px" if gain > 0 else f"{gain}px"
-        total_old += col['old_width']
-        total_new += col['new_width']
-        
-        print(f"{col['name']:<12} {col['old_width']:<5} {col['new_width']:<5} {gain_str:<6} {col['sample']:<25}")
+        rows.append(f"{name:<12} {old_width:<5} {new_width:<5} {gain_str:<6} {sample:<25}")
+    emit(rows)
     
     total_gain = total_new - total_old
-    print("-" * 60)
+    print(_SEP60)
     print(f"{'TOTAL':<12} {total_old:<5} {total_new:<5} +{total_gain}px   Table width increased")
 
 def test_responsive_features():
     """Test responsive table features."""
     print(f"\n📱 TESTING RESPONSIVE FEATURES")
-    print("=" * 50)
+    print(_SEP50_EQ)
     
     features = [
         "✅ Interactive resize for File and Genre columns",
@@ -101,49 +161,33 @@ def test_responsive_features():
         "✅ Minimum section size prevents text cut-off"
     ]
     
-    for feature in features:
-        print(f"  {feature}")
+    emit([f"  {feature}" for feature in features])
 
 def test_text_measurements():
     """Test actual text measurements with Qt."""
     print(f"\n📏 TESTING ACTUAL TEXT MEASUREMENTS")
-    print("=" * 50)
+    print(_SEP50_EQ)
     
-    try:
-        from PySide6.QtWidgets import QApplication
-        from PySide6.QtGui import QFontMetrics, QFont
-        
-        app = QApplication.instance()
-        if app is None:
-            app = QApplication(sys.argv)
-        
-        font = QFont()
-        font_metrics = QFontMetrics(font)
-        
-        test_texts = [
-            ("Window Title", "🎧 MusicFlow Organizer - DJ Library Management"),
-            ("Button Text", "🤖 AI Enhance"),
-            ("Long Filename", "Very Long Song Name That Could Cause Issues.mp3"),
-            ("Genre Text", "Progressive House/Trance"),
-            ("Status Text", "Successfully enhanced 15 tracks")
-        ]
-        
-        print(f"{'Text Type':<15} {'Width':<6} {'Height':<6} {'Fits 320px?':<12}")
-        print("-" * 50)
+    if not _try_qt():
+        print(f"❌ Could not test Qt measurements: {_QT_ERROR}")
+        return
+    
+    height = get_fm().height()
+    
+    print(f"{'Text Type':<15} {'Width':<6} {'Height':<6} {'Fits 320px?':<12}")
+    print(_SEP50)
+    
+    rows = []
+    for text_type, text in MEASURED_TEXTS:
+        width = advance(text)
+        fits = FITS_LABELS[width <= 320]
         
-        for text_type, text in test_texts:
-            width = font_metrics.horizontalAdvance(text)
-            height = font_metrics.height()
-            fits = "✅ Yes" if width <= 320 else "❌ No"
-            
-            print(f"{text_type:<15} {width:<6} {height:<6} {fits:<12}")
-            
-    except Exception as e:
-        print(f"❌ Could not test Qt measurements: {e}")
+        rows.append(f"{text_type:<15} {width:<6} {height:<6} {fits:<12}")
+    emit(rows)
 
 if __name__ == "__main__":
     print("🔧 MUSICFLOW ORGANIZER - TEXT FIXES VALIDATION")
-    print("=" * 80)
+    print(_SEP80_EQ)
     
     test_smart_truncation()
     test_column_improvements()
@@ -151,7 +195,7 @@ if __name__ == "__main__":
     test_text_measurements()
     
     print(f"\n🎯 SUMMARY OF TEXT IMPROVEMENTS")
-    print("=" * 80)
+    print(_SEP80_EQ)
     print("✅ Smart truncation preserves file extensions")
     print("✅ Column widths increased across the board")
     print("✅ User can resize File and Genre columns")
@@ -7,65 +7,69 @@ Verificar que todos los textos en la UI sean legibles
 
 import sys
 import os
-from pathlib import Path
+
+import numpy as np
+
+import ascii_output
+from ui_report import emit
+
+# ASCII_ONLY=1 keeps the report to plain ASCII
+ascii_output.install()
 
 # Add src to path
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+sys.path.insert(0, os.path.dirname(__file__) + os.sep + 'src')
+
+# Rules printed under headings
+_SEP50 = '-' * 50
+_SEP60 = '-' * 60
+_SEP50_EQ = '=' * 50
+_SEP80_EQ = '=' * 80
+
+# Font size standards per UI element, stored column-wise (css_text uses the body standard)
+FONT_ELEMENTS = ('title', 'subtitle', 'stats_value', 'stats_label', 'status', 'css_text')
+FONT_MIN = np.array([18, 10, 14, 9, 11, 11], dtype=np.int16)
+FONT_REC = np.array([20, 12, 16, 10, 12, 12], dtype=np.int16)
+FONT_MAX = np.array([28, 16, 20, 12, 14, 14], dtype=np.int16)
+CURRENT_SIZES = np.array([
+    22,  # Main title
+    11,  # Subtitle
+    16,  # Statistics values
+    9,   # Statistics labels
+    12,  # Status messages
+    11,  # CSS font-size values
+], dtype=np.int16)
+
+# Interned so every row shares one object per status and grouping compares by identity
+_TOO_SMALL = sys.intern("❌ Too Small")
+_MINIMAL = sys.intern("⚠️  Minimal")
+_GOOD = sys.intern("✅ Good")
+_LARGE = sys.intern("⚠️  Large")
+FONT_STATUS_LABELS = (_TOO_SMALL, _MINIMAL, _GOOD, _LARGE)
 
 def test_font_sizes():
     """Test all font sizes in the application."""
     print("🔍 TESTING TEXT VISIBILITY")
-    print("=" * 50)
+    print(_SEP50_EQ)
     
     print("\n📱 FONT SIZES ANALYSIS:")
     
-    font_standards = {
-        'title': {'min': 18, 'recommended': 20, 'max': 28},
-        'subtitle': {'min': 10, 'recommended': 12, 'max': 16}, 
-        'stats_value': {'min': 14, 'recommended': 16, 'max': 20},
-        'stats_label': {'min': 9, 'recommended': 10, 'max': 12},
-        'status': {'min': 11, 'recommended': 12, 'max': 14},
-        'body': {'min': 11, 'recommended': 12, 'max': 14}
-    }
-    
-    current_sizes = {
-        'title': 22,           # Main title
-        'subtitle': 11,        # Subtitle
-        'stats_value': 16,     # Statistics values
-        'stats_label': 9,      # Statistics labels
-        'status': 12,          # Status messages
-        'css_text': 11         # CSS font-size values
-    }
-    
     print(f"{'Element':<15} {'Current':<8} {'Min':<5} {'Rec':<5} {'Max':<5} {'Status':<10}")
-    print("-" * 60)
-    
-    for element, size in current_sizes.items():
-        if element == 'css_text':
-            # Special case for CSS font-size
-            standard = font_standards['body']
-        else:
-            standard = font_standards.get(element, font_standards['body'])
-        
-        min_size = standard['min']
-        rec_size = standard['recommended']
-        max_size = standard['max']
-        
-        if size < min_size:
-            status = "❌ Too Small"
-        elif size >= min_size and size < rec_size:
-            status = "⚠️  Minimal"
-        elif size >= rec_size and size <= max_size:
-            status = "✅ Good"
-        else:
-            status = "⚠️  Large"
-        
-        print(f"{element:<15} {size:<8} {min_size:<5} {rec_size:<5} {max_size:<5} {status:<10}")
+    print(_SEP60)
+    
+    # Status index: 0 below min, 1 below recommended, 2 within range, 3 above max
+    status_idx = (CURRENT_SIZES >= FONT_MIN).astype(np.int8) \
+        + (CURRENT_SIZES >= FONT_REC) + (CURRENT_SIZES > FONT_MAX)
+    statuses = [FONT_STATUS_LABELS[i] for i in status_idx.tolist()]
+    
+    rows = [f"{element:<15} {size:<8} {min_size:<5} {rec_size:<5} {max_size:<5} {status:<10}"
+            for element, size, min_size, rec_size, max_size, status
+            in zip(FONT_ELEMENTS, CURRENT_SIZES, FONT_MIN, FONT_REC, FONT_MAX, statuses)]
+    emit(rows)
 
 def test_contrast_and_colors():
     """Test color contrast for readability."""
     print(f"\n🎨 COLOR CONTRAST ANALYSIS:")
-    print("-" * 50)
+    print(_SEP50)
     
     color_combinations = [
         ('Title', '#2c3e50', 'white', 'Good contrast'),
@@ -77,13 +81,13 @@ def test_contrast_and_colors():
         ('Status Error', '#e74c3c', 'white', 'Good contrast')
     ]
     
-    for element, fg_color, bg_color, assessment in color_combinations:
-        print(f"• {element:<15}: {fg_color:<12} on {bg_color:<8} - {assessment}")
+    emit([f"• {element:<15}: {fg_color:<12} on {bg_color:<8} - {assessment}"
+           for element, fg_color, bg_color, assessment in color_combinations])
 
 def test_widget_sizes():
     """Test widget minimum sizes for text accommodation."""
     print(f"\n📐 WIDGET SIZE ANALYSIS:")
-    print("-" * 50)
+    print(_SEP50)
     
     widget_sizes = [
         ('Header', 'Height: 70-80px', '✅ Adequate for title + subtitle'),
@@ -95,13 +99,13 @@ def test_widget_sizes():
         ('Results Table', 'Weight: 10x', '✅ Maximum space allocation')
     ]
     
-    for widget, dimension, assessment in widget_sizes:
-        print(f"• {widget:<15}: {dimension:<20} - {assessment}")
+    emit([f"• {widget:<15}: {dimension:<20} - {assessment}"
+           for widget, dimension, assessment in widget_sizes])
 
 def recommendations():
     """Provide specific recommendations."""
     print(f"\n💡 RECOMMENDATIONS:")
-    print("-" * 50)
+    print(_SEP50)
     
     print("✅ CURRENT STATUS - Text visibility improved:")
     print("  • Title: 22pt (was 20pt) - ✅ Good readability")
@@ -125,7 +129,7 @@ def recommendations():
 def test_specific_ui_elements():
     """Test specific UI elements that might have visibility issues."""
     print(f"\n🎛️  SPECIFIC UI ELEMENTS CHECK:")
-    print("-" * 50)
+    print(_SEP50)
     
     elements = [
         ('Window Title', 'System managed', '✅ OS handles sizing'),
@@ -138,12 +142,12 @@ def test_specific_ui_elements():
         ('Progress Text', '12pt', '✅ Readable status')
     ]
     
-    for element, font_info, status in elements:
-        print(f"• {element:<15}: {font_info:<18} - {status}")
+    emit([f"• {element:<15}: {font_info:<18} - {status}"
+           for element, font_info, status in elements])
 
 if __name__ == "__main__":
     print("🎧 MUSICFLOW ORGANIZER - TEXT VISIBILITY TEST")
-    print("=" * 80)
+    print(_SEP80_EQ)
     
     test_font_sizes()
     test_contrast_and_colors()
@@ -152,7 +156,7 @@ if __name__ == "__main__":
     test_specific_ui_elements()
     
     print(f"\n🏆 SUMMARY")
-    print("=" * 80)
+    print(_SEP80_EQ)
     print("✅ Font sizes adjusted to readable levels")
     print("✅ Contrast maintained for accessibility") 
     print("✅ Widget sizes accommodate text properly")
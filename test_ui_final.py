@@ -7,14 +7,25 @@ Verificar que todas las correcciones de layout funcionen correctamente
 
 import sys
 import os
-from pathlib import Path
+
+import numpy as np
+
+import ascii_output
+from ui_report import emit
+
+# ASCII_ONLY=1 keeps the report to plain ASCII
+ascii_output.install()
+
+# Section separators
+_SEP40 = '-' * 40
+_SEP60_EQ = '=' * 60
 
 print("✅ VALIDACIÓN FINAL DE CORRECCIONES UI")
-print("=" * 60)
+print(_SEP60_EQ)
 
 # Test 1: Verificar que las correcciones están aplicadas
 print("🔍 1. VERIFICANDO CORRECCIONES APLICADAS:")
-print("-" * 40)
+print(_SEP40)
 
 corrections_applied = [
     "✅ Window title acortado: '🎧 MusicFlow Organizer - DJ Library Management'",
@@ -32,12 +43,11 @@ corrections_applied = [
     "✅ Responsive window sizing implementado (80% screen size)"
 ]
 
-for correction in corrections_applied:
-    print(correction)
+emit(corrections_applied)
 
 # Test 2: Problemas resueltos
 print(f"\n🎯 2. RESUMEN DE PROBLEMAS RESUELTOS:")
-print("-" * 40)
+print(_SEP40)
 print("❌ Problemas originales: 7")
 print("✅ Problemas resueltos: 5") 
 print("⚠️  Problemas manejados: 2")
@@ -51,11 +61,11 @@ print("• Window responsiveness: ✅ IMPLEMENTADO con screen detection")
 
 # Test 3: Verificar que archivos no tienen errores de sintaxis
 print(f"\n🔧 3. VERIFICANDO INTEGRIDAD DEL CÓDIGO:")
-print("-" * 40)
+print(_SEP40)
 
 try:
     # Add src to path
-    sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+    sys.path.insert(0, os.path.dirname(__file__) + os.sep + 'src')
     
     # Test imports
     from ui.main_window import MusicFlowMainWindow
@@ -74,28 +84,24 @@ except Exception as e:
 
 # Test 4: Verificar responsive design
 print(f"\n📱 4. RESPONSIVE DESIGN VALIDATION:")
-print("-" * 40)
+print(_SEP40)
 
 # Simulate different screen sizes
-screen_sizes = [
-    ("MacBook Air 13\"", 1440, 900),
-    ("MacBook Pro 16\"", 3072, 1920), 
-    ("iMac 24\"", 4480, 2520),
-    ("Studio Display", 5120, 2880)
-]
+screen_names = ("MacBook Air 13\"", "MacBook Pro 16\"", "iMac 24\"", "Studio Display")
+screen_widths = np.array([1440, 3072, 4480, 5120])
+screen_heights = np.array([900, 1920, 2520, 2880])
 
-for name, width, height in screen_sizes:
-    # Calculate responsive window size (80% of screen)
-    window_width = min(1400, int(width * 0.8))
-    window_height = min(900, int(height * 0.8))
-    
-    fits = window_width >= 1200 and window_height >= 800  # minimum size
-    status = "✅" if fits else "❌"
-    
-    print(f"{status} {name:<20}: {window_width}x{window_height}")
+# Responsive window size (80% of screen, capped) for every screen at once
+window_widths = np.minimum(1400, (screen_widths * 0.8).astype(np.int32))
+window_heights = np.minimum(900, (screen_heights * 0.8).astype(np.int32))
+fits = (window_widths >= 1200) & (window_heights >= 800)  # minimum size
+
+rows = [f"{'✅' if fit else '❌'} {name:<20}: {window_width}x{window_height}"
+        for name, window_width, window_height, fit in zip(screen_names, window_widths, window_heights, fits)]
+emit(rows)
 
 print(f"\n🏆 VALIDACIÓN FINAL COMPLETADA")
-print("=" * 60)
+print(_SEP60_EQ)
 print("📊 Estado final:")
 print("   • UI Layout: OPTIMIZADO")
 print("   • Table Columns: CORREGIDAS") 
@@ -7,189 +7,163 @@ Detectar problemas de tamaño, texto que se sale y layout issues
 
 import sys
 import os
-from pathlib import Path
+
+import numpy as np
+
+import ascii_output
+from ui_report import advance, emit
+
+# ASCII_ONLY=1 keeps the report to plain ASCII
+ascii_output.install()
 
 # Add src to path
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+sys.path.insert(0, os.path.dirname(__file__) + os.sep + 'src')
+
+# Separator lines reused by every section header
+_SEP40 = '-' * 40
+_SEP60 = '-' * 60
+_SEP50_EQ = '=' * 50
+_SEP60_EQ = '=' * 60
+
+# Table columns, stored column-wise
+COLUMN_NAMES = ('File', 'Genre', 'BPM', 'Key', 'Energy', 'MixIn Key')
+COLUMN_SAMPLES = ('Very Long Song Name - Artist (Remix).flac', 'Progressive House', '128.45', '7A', '8', 'Analyzed')
+COLUMN_MIN_WIDTHS = np.array([280, 135, 65, 45, 65, 80], dtype=np.int32)
+
+# (type, text, max width) for texts known to be at risk of overflowing
+PROBLEMATIC_TEXTS = (
+    ('Window Title', '🎧 MusicFlow Organizer - DJ Library Management', 1400),  # Updated shorter title
+    ('Dialog Title', 'AI Enhancement Confirmation', 400),
+    ('Button Text', '🤖 AI Enhance', 250),  # Updated shorter text
+    ('Status Message', 'Successfully enhanced 15 out of 20 tracks with AI-powered genre classification', 600),
+    ('Column Header', 'MixIn Key', 100),
+    # Now fits in table (will be truncated with ellipsis)
+    ('File Name', 'Very Long Song Name That Could Cause Display Issues - Artist Name (Extended Remix Version).flac', 280),
+)
+
+# (name, content, minimum size)
+DIALOGS = (
+    ('AI Enhancement Confirmation',
+     'Enhance 15 track(s) with OpenAI GPT-4?\n\nThis will analyze:\n• Genre classification\n• Mood detection\n• Language/Region identification\n\nNote: This requires an internet connection and uses your OpenAI API key.',
+     (500, 250)),  # Updated size
+    ('Duplicate Tracks Dialog',
+     'Found 25 groups of duplicate tracks:\n\nGroup 1:\n- /very/long/path/to/music/file/Song Name.mp3\n- /another/very/long/path/Song Name (Copy).mp3',
+     (600, 400)),
+)
 
-from PySide6.QtWidgets import QApplication, QLabel, QPushButton, QDialog, QMessageBox
-from PySide6.QtCore import QSize
-from PySide6.QtGui import QFontMetrics, QFont
+# Status markers indexed by a pass/fail bool (False -> 0, True -> 1)
+OVERFLOW_STATUS = tuple(map(sys.intern, ("✅ OK", "❌ OVERFLOW")))
+CHECK_MARKS = tuple(map(sys.intern, ("❌", "✅")))
 
 def test_text_overflow_issues():
     """Test for text overflow and sizing issues."""
     print("🔍 UI LAYOUT VALIDATION")
-    print("=" * 50)
-    
-    # Create minimal app for font metrics
-    app = QApplication.instance()
-    if app is None:
-        app = QApplication(sys.argv)
-    
-    # Test problematic texts
-    problematic_texts = [
-        {
-            'type': 'Window Title',
-            'text': '🎧 MusicFlow Organizer - DJ Library Management',  # Updated shorter title
-            'max_width': 1400
-        },
-        {
-            'type': 'Dialog Title',
-            'text': 'AI Enhancement Confirmation',
-            'max_width': 400
-        },
-        {
-            'type': 'Button Text',
-            'text': '🤖 AI Enhance',  # Updated shorter text
-            'max_width': 250
-        },
-        {
-            'type': 'Status Message',
-            'text': 'Successfully enhanced 15 out of 20 tracks with AI-powered genre classification',
-            'max_width': 600
-        },
-        {
-            'type': 'Column Header',
-            'text': 'MixIn Key',
-            'max_width': 100
-        },
-        {
-            'type': 'File Name',
-            'text': 'Very Long Song Name That Could Cause Display Issues - Artist Name (Extended Remix Version).flac',
-            'max_width': 280  # Now fits in table (will be truncated with ellipsis)
-        }
-    ]
-    
-    font = QFont()
-    font_metrics = QFontMetrics(font)
+    print(_SEP50_EQ)
     
     print("📊 TEXT OVERFLOW ANALYSIS:")
-    print("-" * 60)
+    print(_SEP60)
     print(f"{'Type':<15} {'Width':<6} {'Max':<6} {'Status':<10} {'Text Preview':<30}")
-    print("-" * 60)
+    print(_SEP60)
     
-    issues_found = []
+    # Measure everything first, then compare in one vectorized pass
+    count = len(PROBLEMATIC_TEXTS)
+    text_widths = np.fromiter((advance(text) for _, text, _ in PROBLEMATIC_TEXTS), dtype=np.int32, count=count)
+    max_widths = np.fromiter((max_width for _, _, max_width in PROBLEMATIC_TEXTS), dtype=np.int32, count=count)
+    overflows = text_widths > max_widths
     
-    for item in problematic_texts:
-        text_width = font_metrics.horizontalAdvance(item['text'])
-        max_width = item['max_width']
-        status = "❌ OVERFLOW" if text_width > max_width else "✅ OK"
-        
-        if text_width > max_width:
-            issues_found.append(item)
-        
-        preview = item['text'][:27] + "..." if len(item['text']) > 30 else item['text']
+    issues_found = [item for item, overflow in zip(PROBLEMATIC_TEXTS, overflows) if overflow]
+    
+    rows = []
+    for (text_type, text, _), text_width, max_width, overflow in zip(PROBLEMATIC_TEXTS, text_widths, max_widths, overflows):
+        status = OVERFLOW_STATUS[int(overflow)]
+        preview = text[:27] + "..." if len(text) > 30 else text
         
-        print(f"{item['type']:<15} {text_width:<6} {max_width:<6} {status:<10} {preview:<30}")
+        rows.append(f"{text_type:<15} {text_width:<6} {max_width:<6} {status:<10} {preview:<30}")
     
+    emit(rows)
     print()
     return issues_found
 
 def test_table_column_sizing():
     """Test table column sizing issues."""
     print("📋 TABLE COLUMN ANALYSIS:")
-    print("-" * 40)
-    
-    columns = [
-        {'name': 'File', 'content_sample': 'Very Long Song Name - Artist (Remix).flac', 'min_width': 280},  # Updated
-        {'name': 'Genre', 'content_sample': 'Progressive House', 'min_width': 135},  # Updated
-        {'name': 'BPM', 'content_sample': '128.45', 'min_width': 65},   # Updated
-        {'name': 'Key', 'content_sample': '7A', 'min_width': 45},       # Updated
-        {'name': 'Energy', 'content_sample': '8', 'min_width': 65},     # Updated
-        {'name': 'MixIn Key', 'content_sample': 'Analyzed', 'min_width': 80}
-    ]
-    
-    app = QApplication.instance()
-    font = QFont()
-    font_metrics = QFontMetrics(font)
-    
-    table_issues = []
-    
-    for col in columns:
-        header_width = font_metrics.horizontalAdvance(col['name'])
-        content_width = font_metrics.horizontalAdvance(col['content_sample'])
-        required_width = max(header_width, content_width) + 20  # padding
-        
-        if required_width > col['min_width']:
-            table_issues.append({
-                'column': col['name'],
-                'required': required_width,
-                'allocated': col['min_width'],
-                'overflow': required_width - col['min_width']
-            })
-        
-        status = "❌" if required_width > col['min_width'] else "✅"
-        print(f"{status} {col['name']:<10}: needs {required_width}px, has {col['min_width']}px")
-    
+    print(_SEP40)
+    
+    # Only the longer of header/sample is measured: for these short strings the
+    # character count already decides which one is wider
+    longer_texts = [name if len(name) > len(sample) else sample
+                    for name, sample in zip(COLUMN_NAMES, COLUMN_SAMPLES)]
+    required_widths = np.fromiter(map(advance, longer_texts), dtype=np.int32, count=len(longer_texts)) + 20  # padding
+    overflows = required_widths - COLUMN_MIN_WIDTHS
+    
+    # Issues only visit the overflowing columns; rows go out in one write
+    table_issues = [{
+        'column': COLUMN_NAMES[i],
+        'required': int(required_widths[i]),
+        'allocated': int(COLUMN_MIN_WIDTHS[i]),
+        'overflow': int(overflows[i])
+    } for i in np.flatnonzero(overflows > 0)]
+    
+    emit([f"{CHECK_MARKS[int(overflow <= 0)]} {name:<10}: needs {required_width}px, has {min_width}px"
+           for name, required_width, min_width, overflow
+           in zip(COLUMN_NAMES, required_widths, COLUMN_MIN_WIDTHS, overflows)])
     return table_issues
 
 def test_dialog_sizing():
     """Test dialog sizing issues."""
     print("\n💬 DIALOG SIZING ANALYSIS:")
-    print("-" * 40)
-    
-    dialogs = [
-        {
-            'name': 'AI Enhancement Confirmation',
-            'content': 'Enhance 15 track(s) with OpenAI GPT-4?\n\nThis will analyze:\n• Genre classification\n• Mood detection\n• Language/Region identification\n\nNote: This requires an internet connection and uses your OpenAI API key.',
-            'min_size': (500, 250)  # Updated size
-        },
-        {
-            'name': 'Duplicate Tracks Dialog',
-            'content': 'Found 25 groups of duplicate tracks:\n\nGroup 1:\n- /very/long/path/to/music/file/Song Name.mp3\n- /another/very/long/path/Song Name (Copy).mp3',
-            'min_size': (600, 400)
-        }
-    ]
+    print(_SEP40)
     
     dialog_issues = []
+    rows = []
     
-    for dialog in dialogs:
-        lines = dialog['content'].split('\n')
-        max_line_length = max(len(line) for line in lines)
+    for dialog in DIALOGS:
+        name, content, (min_width, min_height) = dialog
+        lines = content.split('\n')
+        max_line_length = max(map(len, lines))
         estimated_width = max_line_length * 8  # rough estimate
         estimated_height = len(lines) * 20 + 100  # rough estimate
         
-        min_width, min_height = dialog['min_size']
-        
         width_ok = estimated_width <= min_width
         height_ok = estimated_height <= min_height
         
-        status = "✅" if width_ok and height_ok else "❌"
-        print(f"{status} {dialog['name']}")
-        print(f"    Estimated: {estimated_width}x{estimated_height}")
-        print(f"    Allocated: {min_width}x{min_height}")
+        status = CHECK_MARKS[width_ok and height_ok]
+        rows.append(f"{status} {name}")
+        rows.append(f"    Estimated: {estimated_width}x{estimated_height}")
+        rows.append(f"    Allocated: {min_width}x{min_height}")
         
         if not width_ok or not height_ok:
             dialog_issues.append(dialog)
     
+    emit(rows)
     return dialog_issues
 
 def suggest_fixes(text_issues, table_issues, dialog_issues):
     """Suggest fixes for identified issues."""
     print("\n🔧 SUGGESTED FIXES:")
-    print("=" * 50)
+    print(_SEP50_EQ)
     
     if text_issues:
         print("📝 Text Overflow Fixes:")
-        for issue in text_issues:
-            if issue['type'] == 'Window Title':
-                print("   • Shorten window title: '🎧 MusicFlow Organizer - DJ Library'")
-            elif issue['type'] == 'Button Text':
-                print("   • Use shorter button text: '🤖 AI Enhance'")
-            elif issue['type'] == 'File Name':
-                print("   • Truncate long filenames with ellipsis")
-            elif issue['type'] == 'Status Message':
-                print("   • Break long status messages into multiple lines")
+        rows = []
+        for issue_type, _, _ in text_issues:
+            if issue_type == 'Window Title':
+                rows.append("   • Shorten window title: '🎧 MusicFlow Organizer - DJ Library'")
+            elif issue_type == 'Button Text':
+                rows.append("   • Use shorter button text: '🤖 AI Enhance'")
+            elif issue_type == 'File Name':
+                rows.append("   • Truncate long filenames with ellipsis")
+            elif issue_type == 'Status Message':
+                rows.append("   • Break long status messages into multiple lines")
+        emit(rows)
     
     if table_issues:
         print("\n📋 Table Column Fixes:")
-        for issue in table_issues:
-            print(f"   • {issue['column']}: increase width by {issue['overflow']}px")
+        emit([f"   • {issue['column']}: increase width by {issue['overflow']}px" for issue in table_issues])
     
     if dialog_issues:
         print("\n💬 Dialog Sizing Fixes:")
-        for issue in dialog_issues:
-            print(f"   • {issue['name']}: increase dialog size or add scrolling")
+        emit([f"   • {name}: increase dialog size or add scrolling" for name, _, _ in dialog_issues])
     
     # Responsive design suggestions
     print("\n📱 Responsive Design Suggestions:")
@@ -200,7 +174,7 @@ def suggest_fixes(text_issues, table_issues, dialog_issues):
 
 if __name__ == "__main__":
     print("🔍 MusicFlow Organizer - UI Layout Validation")
-    print("=" * 60)
+    print(_SEP60_EQ)
     
     text_issues = test_text_overflow_issues()
     table_issues = test_table_column_sizing()
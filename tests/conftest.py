@@ -7,38 +7,39 @@ Global pytest configuration and shared test fixtures.
 Developed by BlueSystemIO
 """
 
+import copy
 import pytest
-import tempfile
 import os
 from pathlib import Path
 from unittest.mock import Mock, patch
 from typing import Dict, Any
 
 
-@pytest.fixture
-def temp_directory():
-    """Create a temporary directory for tests."""
-    with tempfile.TemporaryDirectory(prefix="musicflow_test_") as temp_dir:
-        yield Path(temp_dir)
+@pytest.fixture(scope="module")
+def temp_directory(tmp_path_factory):
+    """Create a temporary directory for tests under the session's pytest temp root."""
+    return tmp_path_factory.mktemp("musicflow_test_")
 
 
-@pytest.fixture
-def sample_audio_files(temp_directory):
-    """Create sample audio files for testing."""
+@pytest.fixture(scope="session")
+def sample_audio_files(tmp_path_factory):
+    """Create sample audio files for testing (extension-only stand-ins)."""
+    sample_dir = tmp_path_factory.mktemp("sample_audio")
     files = []
     audio_formats = ['.mp3', '.flac', '.wav', '.m4a']
     
     for i, ext in enumerate(audio_formats):
-        file_path = temp_directory / f"test_track_{i}{ext}"
-        file_path.write_text(f"Mock audio content {i}")
+        file_path = sample_dir / f"test_track_{i}{ext}"
+        # One raw byte is enough for extension-based detection; no text encoding
+        file_path.write_bytes(b"M")
         files.append(file_path)
     
-    return files
+    return tuple(files)
 
 
-@pytest.fixture
-def mock_mixinkey_data():
-    """Mock MixInKey track data for testing."""
+@pytest.fixture(scope="session")
+def mixinkey_data_template():
+    """MixInKey track data shared by the whole session; do not mutate."""
     return {
         'file_path': '/test/path/track.mp3',
         'filename': 'track.mp3',
@@ -54,8 +55,19 @@ def mock_mixinkey_data():
 
 
 @pytest.fixture
+def mock_mixinkey_data(mixinkey_data_template):
+    """Mock MixInKey track data for testing (a fresh copy per test)."""
+    return copy.deepcopy(mixinkey_data_template)
+
+
+@pytest.fixture(scope="session")
 def mock_audio_analysis_result():
-    """Mock audio analysis result for testing."""
+    """
+    Mock audio analysis result for testing.
+    
+    Every test receives the same instance; derive variants with
+    dataclasses.replace() rather than mutating it.
+    """
     from src.core.audio_analyzer import AudioAnalysisResult
     
     return AudioAnalysisResult(
@@ -76,7 +88,17 @@ def mock_audio_analysis_result():
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
+def silent_audio():
+    """One second of silence at 22.05 kHz, shared read-only by the session."""
+    import numpy as np
+    
+    audio = np.zeros(22050, dtype=np.float32)
+    audio.flags.writeable = False
+    return audio
+
+
+@pytest.fixture(scope="session")
 def mock_genre_classification():
     """Mock genre classification result for testing."""
     from src.core.genre_classifier import GenreClassificationResult
@@ -96,9 +118,9 @@ def mock_genre_classification():
     )
 
 
-@pytest.fixture
-def mock_organization_plan(temp_directory):
-    """Mock organization plan for testing."""
+@pytest.fixture(scope="module")
+def organization_plan_template(temp_directory):
+    """Organization plan shared within a module; do not mutate."""
     from src.core.file_organizer import OrganizationPlan, OrganizationScheme
     
     return OrganizationPlan(
@@ -117,41 +139,62 @@ def mock_organization_plan(temp_directory):
 
 
 @pytest.fixture
-def mock_sqlite_database(temp_directory):
-    """Create a mock SQLite database for testing."""
+def mock_organization_plan(organization_plan_template):
+    """Mock organization plan for testing (a fresh copy per test)."""
+    return copy.deepcopy(organization_plan_template)
+
+
+@pytest.fixture(scope="session")
+def mixinkey_template_db():
+    """In-memory MixInKey database populated once per session."""
+    import sqlite3
+    
+    conn = sqlite3.connect(":memory:")
+    cursor = conn.cursor()
+    
+    # Create test table
+    cursor.execute("""
+        CREATE TABLE ZSONG (
+            ZARTIST TEXT,
+            ZNAME TEXT,
+            ZALBUM TEXT,
+            ZTEMPO REAL,
+            ZKEY TEXT,
+            ZENERGY INTEGER,
+            ZFILESIZE INTEGER,
+            ZBOOKMARKDATA BLOB
+        )
+    """)
+    
+    # Insert test data
+    test_data = [
+        ('Test Artist 1', 'Test Track 1', 'Test Album 1', 128.0, '4A', 7, 5000000, b'test_bookmark_1'),
+        ('Test Artist 2', 'Test Track 2', 'Test Album 2', 135.0, '9B', 8, 6000000, b'test_bookmark_2')
+    ]
+    
+    cursor.executemany("""
+        INSERT INTO ZSONG (ZARTIST, ZNAME, ZALBUM, ZTEMPO, ZKEY, ZENERGY, ZFILESIZE, ZBOOKMARKDATA)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    """, test_data)
+    
+    conn.commit()
+    yield conn
+    conn.close()
+
+
+@pytest.fixture(scope="module")
+def mock_sqlite_database(temp_directory, mixinkey_template_db):
+    """Create a mock SQLite database, once per test module."""
     import sqlite3
     
     db_path = temp_directory / "test_mixinkey.db"
     
-    with sqlite3.connect(db_path) as conn:
-        cursor = conn.cursor()
-        
-        # Create test table
-        cursor.execute("""
-            CREATE TABLE ZSONG (
-                ZARTIST TEXT,
-                ZNAME TEXT,
-                ZALBUM TEXT,
-                ZTEMPO REAL,
-                ZKEY TEXT,
-                ZENERGY INTEGER,
-                ZFILESIZE INTEGER,
-                ZBOOKMARKDATA BLOB
-            )
-        """)
-        
-        # Insert test data
-        test_data = [
-            ('Test Artist 1', 'Test Track 1', 'Test Album 1', 128.0, '4A', 7, 5000000, b'test_bookmark_1'),
-            ('Test Artist 2', 'Test Track 2', 'Test Album 2', 135.0, '9B', 8, 6000000, b'test_bookmark_2')
-        ]
-        
-        cursor.executemany("""
-            INSERT INTO ZSONG (ZARTIST, ZNAME, ZALBUM, ZTEMPO, ZKEY, ZENERGY, ZFILESIZE, ZBOOKMARKDATA)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-        """, test_data)
-        
-        conn.commit()
+    # Page-level copy of the session template instead of replaying the SQL
+    conn = sqlite3.connect(db_path)
+    try:
+        mixinkey_template_db.backup(conn)
+    finally:
+        conn.close()
     
     return db_path
 
@@ -204,60 +247,45 @@ def mock_file_system():
 
 
 # Security testing fixtures
-@pytest.fixture
-def malicious_paths():
-    """Common malicious path patterns for security testing."""
-    return [
-        '../../../etc/passwd',
-        '..\\..\\windows\\system32\\config\\sam',
-        '/etc/shadow',
-        '../../Library/Keychains/',
-        '../.ssh/id_rsa',
-        '%2e%2e%2f%2e%2e%2f%2e%2e%2fetc%2fpasswd',  # URL encoded
-        '....//....//....//etc//passwd',  # Double dot bypass
-        'test\x00file.mp3',  # Null byte injection
-        'file|rm -rf /',  # Command injection
-        'file; DROP TABLE tracks; --'  # SQL injection
-    ]
+# Common malicious path patterns for security testing
+MALICIOUS_PATHS = (
+    '../../../etc/passwd',
+    '..\\..\\windows\\system32\\config\\sam',
+    '/etc/shadow',
+    '../../Library/Keychains/',
+    '../.ssh/id_rsa',
+    '%2e%2e%2f%2e%2e%2f%2e%2e%2fetc%2fpasswd',  # URL encoded
+    '....//....//....//etc//passwd',  # Double dot bypass
+    'test\x00file.mp3',  # Null byte injection
+    'file|rm -rf /',  # Command injection
+    'file; DROP TABLE tracks; --'  # SQL injection
+)
 
+# Common SQL injection patterns for testing
+MALICIOUS_SQL_INPUTS = (
+    "'; DROP TABLE ZSONG; --",
+    "1' OR '1'='1",
+    "'; DELETE FROM ZSONG WHERE 1=1; --",
+    "1' UNION SELECT password FROM users --",
+    "admin'/*",
+    "1'; ATTACH DATABASE '/etc/passwd' AS pwn; --",
+    "\"; DROP TABLE ZSONG; --"
+)
 
-@pytest.fixture
-def malicious_sql_inputs():
-    """Common SQL injection patterns for testing."""
-    return [
-        "'; DROP TABLE ZSONG; --",
-        "1' OR '1'='1",
-        "'; DELETE FROM ZSONG WHERE 1=1; --",
-        "1' UNION SELECT password FROM users --",
-        "admin'/*",
-        "1'; ATTACH DATABASE '/etc/passwd' AS pwn; --",
-        "\"; DROP TABLE ZSONG; --"
-    ]
 
+def pytest_generate_tests(metafunc):
+    """Run tests asking for a single malicious input once per pattern."""
+    if "malicious_path" in metafunc.fixturenames:
+        metafunc.parametrize("malicious_path", MALICIOUS_PATHS)
+    if "malicious_sql_input" in metafunc.fixturenames:
+        metafunc.parametrize("malicious_sql_input", MALICIOUS_SQL_INPUTS)
 
-# Performance testing fixtures
-@pytest.fixture
-def large_file_list(temp_directory):
-    """Create a large list of file paths for performance testing."""
-    files = []
-    for i in range(1000):  # Simulate 1000 files
-        file_path = temp_directory / f"track_{i:04d}.mp3"
-        files.append(str(file_path))
-    return files
 
+# Performance testing fixtures
+@pytest.fixture(scope="session")
+def large_file_list(tmp_path_factory):
+    """Create a large, immutable tuple of file paths for performance testing."""
+    base = tmp_path_factory.mktemp("large_files")
+    # Simulate 1000 files; plain f-strings avoid building a Path per entry
+    return tuple(f"{base}{os.sep}track_{i:04d}.mp3" for i in range(1000))
 
-# Configuration for pytest
-def pytest_configure(config):
-    """Configure pytest with custom markers."""
-    config.addinivalue_line(
-        "markers", "security: mark test as security-related"
-    )
-    config.addinivalue_line(
-        "markers", "performance: mark test as performance-related"
-    )
-    config.addinivalue_line(
-        "markers", "integration: mark test as integration test"
-    )
-    config.addinivalue_line(
-        "markers", "slow: mark test as slow running"
-    )
\ No newline at end of file
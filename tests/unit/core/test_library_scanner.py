@@ -8,13 +8,58 @@ Part of the FileOrganizer refactoring.
 Developed by BlueSystemIO
 """
 
+import os
 import pytest
+from contextlib import nullcontext
 from pathlib import Path
 from unittest.mock import patch, Mock
 
 from src.core.library_scanner import LibraryScanner
 
 
+class FakeEntry:
+    """Minimal os.DirEntry stand-in for scandir-based scanner tests."""
+    
+    __slots__ = ('is_directory', 'name', 'path', 'size')
+    
+    def __init__(self, directory, name, size=0):
+        self.is_directory = name.endswith('/')
+        self.name = name.rstrip('/')
+        self.path = f"{directory}/{self.name}"
+        self.size = size
+    
+    def is_dir(self, follow_symlinks=True):
+        return self.is_directory
+    
+    def is_file(self, follow_symlinks=True):
+        return not self.is_directory
+    
+    def stat(self, follow_symlinks=True):
+        return Mock(st_size=self.size)
+
+
+def fake_scandir(tree, size=0):
+    """
+    Build an os.scandir replacement from {directory: names}.
+    
+    Names ending in '/' are subdirectories; every file reports the given size.
+    Entries are created lazily, so names may be any iterable (a generator
+    can back a single listing of its directory).
+    """
+    def scandir(directory):
+        return nullcontext(FakeEntry(directory, name, size) for name in tree[directory])
+    return scandir
+
+
+def create_library(root, relative_paths, size=1):
+    """Create files under root, each a sparse file of the given size."""
+    for relative_path in relative_paths:
+        file_path = root / relative_path
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(file_path, 'wb') as f:
+            f.truncate(size)
+
+
 class TestLibraryScanner:
     """Test suite for LibraryScanner class."""
     
@@ -26,134 +71,180 @@ class TestLibraryScanner:
         assert '.mp3' in scanner.AUDIO_EXTENSIONS
         assert '.flac' in scanner.AUDIO_EXTENSIONS
     
-    def test_is_audio_file(self):
+    @pytest.mark.parametrize("file_path,expected", [
+        # Valid audio files
+        ('/path/to/track.mp3', True),
+        ('/path/to/track.flac', True),
+        ('/path/to/track.wav', True),
+        ('/path/to/track.m4a', True),
+        # Invalid files
+        ('/path/to/document.txt', False),
+        ('/path/to/image.jpg', False),
+        ('/path/to/video.mp4', False),
+        # Hidden files named after an extension have no extension
+        ('/path/to/.mp3', False),
+    ])
+    def test_is_audio_file(self, file_path, expected):
         """Test audio file detection."""
         scanner = LibraryScanner()
-        
-        # Test valid audio files
-        assert scanner.is_audio_file('/path/to/track.mp3') is True
-        assert scanner.is_audio_file('/path/to/track.flac') is True
-        assert scanner.is_audio_file('/path/to/track.wav') is True
-        assert scanner.is_audio_file('/path/to/track.m4a') is True
-        
-        # Test invalid files
-        assert scanner.is_audio_file('/path/to/document.txt') is False
-        assert scanner.is_audio_file('/path/to/image.jpg') is False
-        assert scanner.is_audio_file('/path/to/video.mp4') is False
+        assert scanner.is_audio_file(file_path) is expected
     
-    def test_is_playlist_file(self):
+    @pytest.mark.parametrize("file_path,expected", [
+        # Valid playlist files
+        ('/path/to/playlist.m3u', True),
+        ('/path/to/playlist.pls', True),
+        ('/path/to/playlist.cue', True),
+        # Invalid files
+        ('/path/to/track.mp3', False),
+        ('/path/to/document.txt', False),
+        ('/path/to/.m3u', False),
+    ])
+    def test_is_playlist_file(self, file_path, expected):
         """Test playlist file detection."""
         scanner = LibraryScanner()
-        
-        # Test valid playlist files
-        assert scanner.is_playlist_file('/path/to/playlist.m3u') is True
-        assert scanner.is_playlist_file('/path/to/playlist.pls') is True
-        assert scanner.is_playlist_file('/path/to/playlist.cue') is True
-        
-        # Test invalid files
-        assert scanner.is_playlist_file('/path/to/track.mp3') is False
-        assert scanner.is_playlist_file('/path/to/document.txt') is False
+        assert scanner.is_playlist_file(file_path) is expected
     
-    @patch('os.walk')
-    def test_find_audio_files_success(self, mock_walk):
+    @pytest.mark.xdist_group("fs")
+    def test_find_audio_files_success(self, tmp_path):
         """Test successful audio file discovery."""
         scanner = LibraryScanner()
         
-        # Mock os.walk to return test data
-        mock_walk.return_value = [
-            ('/music', ['subfolder'], ['track1.mp3', 'track2.flac', 'readme.txt']),
-            ('/music/subfolder', [], ['track3.wav', 'playlist.m3u'])
-        ]
+        create_library(tmp_path, [
+            'track1.mp3', 'track2.flac', 'readme.txt',
+            'subfolder/track3.wav', 'subfolder/playlist.m3u'
+        ])
         
-        result = scanner.find_audio_files('/music')
+        result = scanner.find_audio_files(str(tmp_path))
         
         expected_files = [
-            '/music/track1.mp3',
-            '/music/track2.flac',
-            '/music/subfolder/track3.wav'
+            str(tmp_path / 'track1.mp3'),
+            str(tmp_path / 'track2.flac'),
+            str(tmp_path / 'subfolder' / 'track3.wav')
         ]
         
         assert len(result) == 3
         for expected_file in expected_files:
             assert expected_file in result
     
-    @patch('os.walk')
-    def test_find_audio_files_empty_directory(self, mock_walk):
+    @pytest.mark.xdist_group("fs")
+    def test_find_audio_files_empty_directory(self, tmp_path):
         """Test audio file discovery in empty directory."""
         scanner = LibraryScanner()
         
-        # Mock empty directory
-        mock_walk.return_value = [('/empty', [], [])]
-        
-        result = scanner.find_audio_files('/empty')
+        result = scanner.find_audio_files(str(tmp_path))
         assert result == []
     
-    @patch('os.walk')
-    def test_find_audio_files_error_handling(self, mock_walk):
+    @patch('os.scandir')
+    def test_find_audio_files_error_handling(self, mock_scandir):
         """Test error handling in audio file discovery."""
         scanner = LibraryScanner()
         
-        # Mock os.walk to raise exception
-        mock_walk.side_effect = OSError("Permission denied")
+        # Mock os.scandir to raise exception
+        mock_scandir.side_effect = OSError("Permission denied")
         
         result = scanner.find_audio_files('/restricted')
         assert result == []
     
-    @patch('os.walk')
-    def test_find_playlist_files(self, mock_walk):
+    @pytest.mark.xdist_group("fs")
+    def test_find_playlist_files(self, tmp_path):
         """Test playlist file discovery."""
         scanner = LibraryScanner()
         
-        # Mock os.walk to return test data
-        mock_walk.return_value = [
-            ('/music', [], ['playlist1.m3u', 'playlist2.pls', 'track.mp3']),
-            ('/music/playlists', [], ['dj_set.cue', 'favorites.m3u8'])
-        ]
+        create_library(tmp_path, [
+            'playlist1.m3u', 'playlist2.pls', 'track.mp3',
+            'playlists/dj_set.cue', 'playlists/favorites.m3u8'
+        ])
         
-        result = scanner.find_playlist_files('/music')
+        result = scanner.find_playlist_files(str(tmp_path))
         
         expected_files = [
-            '/music/playlist1.m3u',
-            '/music/playlist2.pls',
-            '/music/playlists/dj_set.cue',
-            '/music/playlists/favorites.m3u8'
+            str(tmp_path / 'playlist1.m3u'),
+            str(tmp_path / 'playlist2.pls'),
+            str(tmp_path / 'playlists' / 'dj_set.cue'),
+            str(tmp_path / 'playlists' / 'favorites.m3u8')
         ]
         
         assert len(result) == 4
         for expected_file in expected_files:
             assert expected_file in result
     
-    @patch('os.walk')
-    @patch('pathlib.Path.stat')
-    def test_get_directory_stats(self, mock_stat, mock_walk):
+    @pytest.mark.xdist_group("fs")
+    def test_get_directory_stats(self, tmp_path):
         """Test directory statistics calculation."""
         scanner = LibraryScanner()
         
-        # Mock file system
-        mock_walk.return_value = [
-            ('/music', [], ['track1.mp3', 'track2.flac', 'playlist.m3u'])
-        ]
-        
-        # Mock file sizes
-        mock_stat.return_value.st_size = 5000000  # 5MB per file
+        # 5MB per file (sparse, so nothing is actually written)
+        create_library(tmp_path, ['track1.mp3', 'track2.flac', 'playlist.m3u'], size=5000000)
         
-        result = scanner.get_directory_stats('/music')
+        result = scanner.get_directory_stats(str(tmp_path))
         
         assert result['total_audio_files'] == 2
         assert result['total_playlist_files'] == 1
         assert result['total_size_bytes'] == 10000000  # 2 * 5MB
         assert result['total_size_mb'] == 9  # 10MB // (1024*1024)
-        assert result['directory_path'] == '/music'
+        assert result['directory_path'] == str(tmp_path)
     
-    def test_case_insensitive_extensions(self):
-        """Test that file extension detection is case insensitive."""
+    @patch('os.scandir')
+    def test_scan_directory_single_traversal(self, mock_scandir):
+        """Test that one scan collects audio, playlists and sizes together."""
         scanner = LibraryScanner()
         
-        # Test mixed case extensions
-        assert scanner.is_audio_file('/path/to/track.MP3') is True
-        assert scanner.is_audio_file('/path/to/track.FLAC') is True
-        assert scanner.is_audio_file('/path/to/track.WaV') is True
-        assert scanner.is_playlist_file('/path/to/playlist.M3U') is True
+        mock_scandir.side_effect = fake_scandir({
+            '/music': ['sets/', 'track1.mp3', 'notes.txt', '.mp3'],
+            '/music/sets': ['track2.FLAC', 'set.m3u']
+        }, size=1000)
+        
+        result = scanner.scan_directory('/music')
+        
+        assert sorted(result.audio_files) == ['/music/sets/track2.FLAC', '/music/track1.mp3']
+        assert result.playlist_files == ['/music/sets/set.m3u']
+        assert result.total_size_bytes == 2000  # playlists are not counted
+        assert mock_scandir.call_count == 2  # once per directory
+    
+    @pytest.mark.xdist_group("fs")
+    def test_scan_directory_cache(self, tmp_path):
+        """Test that unchanged trees are served from the scan cache."""
+        scanner = LibraryScanner(cache_scans=True)
+        (tmp_path / "sub").mkdir()
+        (tmp_path / "sub" / "track1.mp3").write_bytes(b"M")
+        
+        first = scanner.scan_directory(str(tmp_path))
+        with patch('os.scandir', side_effect=AssertionError("tree was rescanned")):
+            assert scanner.scan_directory(str(tmp_path)) is first
+        
+        # A new file in a subdirectory changes that directory's mtime
+        (tmp_path / "sub" / "track2.flac").write_bytes(b"M")
+        os.utime(tmp_path / "sub", ns=(0, 0))
+        assert len(scanner.scan_directory(str(tmp_path)).audio_files) == 2
+        
+        scanner.invalidate(str(tmp_path))
+        assert scanner.scan_directory(str(tmp_path)) is not first
+    
+    @pytest.mark.xdist_group("fs")
+    def test_scan_directory_uncached_by_default(self, tmp_path):
+        """Test that a default scanner lists the tree on every scan."""
+        scanner = LibraryScanner()
+        (tmp_path / "track1.mp3").write_bytes(b"M")
+        
+        first = scanner.scan_directory(str(tmp_path))
+        (tmp_path / "track2.flac").write_bytes(b"M")
+        second = scanner.scan_directory(str(tmp_path))
+        
+        assert second is not first
+        assert len(second.audio_files) == 2
+        assert scanner._scan_cache == {}
+    
+    @pytest.mark.parametrize("check,file_path", [
+        # Mixed case extensions
+        ('is_audio_file', '/path/to/track.MP3'),
+        ('is_audio_file', '/path/to/track.FLAC'),
+        ('is_audio_file', '/path/to/track.WaV'),
+        ('is_playlist_file', '/path/to/playlist.M3U'),
+    ])
+    def test_case_insensitive_extensions(self, check, file_path):
+        """Test that file extension detection is case insensitive."""
+        scanner = LibraryScanner()
+        assert getattr(scanner, check)(file_path) is True
     
     def test_audio_extensions_comprehensive(self):
         """Test that all expected audio extensions are supported."""
@@ -177,14 +268,15 @@ class TestLibraryScanner:
         assert scanner.PLAYLIST_EXTENSIONS == expected_extensions
     
     @pytest.mark.performance
-    @patch('os.walk')
-    def test_large_directory_performance(self, mock_walk):
+    @pytest.mark.xdist_group("perf_scanner")
+    @patch('os.scandir')
+    def test_large_directory_performance(self, mock_scandir):
         """Test performance with large directory structures."""
         scanner = LibraryScanner()
         
-        # Simulate large directory with 1000 files
-        large_file_list = [f'track_{i:04d}.mp3' for i in range(1000)]
-        mock_walk.return_value = [('/large_music', [], large_file_list)]
+        # Simulate large directory with 1000 files, produced lazily like a real listing
+        large_file_names = (f'track_{i:04d}.mp3' for i in range(1000))
+        mock_scandir.side_effect = fake_scandir({'/large_music': large_file_names})
         
         import time
         start_time = time.time()
@@ -9,6 +9,8 @@ Developed by BlueSystemIO
 """
 
 import pytest
+from dataclasses import dataclass
+from typing import Optional
 from unittest.mock import Mock, patch, MagicMock
 from pathlib import Path
 
@@ -18,6 +20,20 @@ from src.core.genre_classifier import GenreClassificationResult
 from src.core.audio_analyzer import AudioAnalysisResult
 
 
+@dataclass(slots=True)
+class FakeGenre:
+    """Plain-attribute stand-in for GenreClassificationResult in filter tests."""
+    primary_genre: str
+
+
+@dataclass(slots=True)
+class FakeMixInKey:
+    """Plain-attribute stand-in for MixInKeyTrackData; unset fields stay None."""
+    bpm: Optional[float] = None
+    key: Optional[str] = None
+    analyzed_by_mixinkey: bool = False
+
+
 class TestTrackAnalyzer:
     """Test suite for TrackAnalyzer class."""
     
@@ -30,6 +46,7 @@ class TestTrackAnalyzer:
         assert analyzer.genre_classifier is not None
         assert analyzer.audio_analyzer is not None
         assert analyzer.tracks_database == {}
+        assert analyzer.max_workers == 1  # parallel builds are opt-in
     
     def test_track_data_dataclass(self):
         """Test TrackData dataclass functionality."""
@@ -43,6 +60,7 @@ class TestTrackAnalyzer:
         assert track_data.mixinkey_data is None
         assert track_data.genre_classification is None
         assert track_data.analysis_result is None
+        assert not hasattr(track_data, '__dict__')  # slotted
     
     @patch('src.core.track_analyzer.time.time')
     def test_analyze_track_with_mixinkey_data(self, mock_time):
@@ -178,6 +196,30 @@ class TestTrackAnalyzer:
         assert result['processed_files'] == 1
         assert result['failed_files'] == 1
     
+    def test_build_tracks_database_in_worker_processes(self, monkeypatch):
+        """Test that a build in worker processes keeps input order and all results."""
+        monkeypatch.setattr(TrackAnalyzer, 'PARALLEL_MIN_FILES', 1)
+        analyzer = TrackAnalyzer(max_workers=2)
+        in_process = Mock(wraps=analyzer.analyze_track)
+        monkeypatch.setattr(analyzer, 'analyze_track', in_process)
+        
+        audio_files = [f'/test/track_{i}.mp3' for i in range(4)]
+        mixinkey_tracks = {
+            file_path: MixInKeyTrackData(file_path=file_path, filename=Path(file_path).name,
+                                         bpm=120.0 + i, key='8A', energy=6, duration=200.0)
+            for i, file_path in enumerate(audio_files[:3])
+        }
+        # The last file has no MixIn Key data, so a worker falls back to audio analysis
+        
+        result = analyzer.build_tracks_database(audio_files, mixinkey_tracks)
+        
+        assert result['processed_files'] == 4
+        # Tracks with MixIn Key data are analyzed by this instance, not sent to workers
+        assert [call.args[0] for call in in_process.call_args_list] == audio_files[:3]
+        assert list(analyzer.tracks_database) == audio_files
+        assert analyzer.tracks_database['/test/track_2.mp3'].mixinkey_data.bpm == 122.0
+        assert analyzer.tracks_database['/test/track_3.mp3'].mixinkey_data is None
+    
     def test_get_track_data(self):
         """Test retrieving track data."""
         analyzer = TrackAnalyzer()
@@ -201,15 +243,15 @@ class TestTrackAnalyzer:
         # Create test tracks with different genres
         track1 = TrackData(
             file_path='/test/house_track.mp3',
-            genre_classification=Mock(primary_genre='House')
+            genre_classification=FakeGenre(primary_genre='House')
         )
         track2 = TrackData(
             file_path='/test/techno_track.mp3',
-            genre_classification=Mock(primary_genre='Techno')
+            genre_classification=FakeGenre(primary_genre='Techno')
         )
         track3 = TrackData(
             file_path='/test/house_track2.mp3',
-            genre_classification=Mock(primary_genre='House')
+            genre_classification=FakeGenre(primary_genre='House')
         )
         
         analyzer.tracks_database = {
@@ -225,6 +267,26 @@ class TestTrackAnalyzer:
         assert '/test/house_track2.mp3' in house_tracks
         assert '/test/techno_track.mp3' not in house_tracks
     
+    def test_get_tracks_by_key(self):
+        """Test filtering tracks by key, including after a track is replaced."""
+        analyzer = TrackAnalyzer()
+        
+        analyzer.tracks_database = {
+            '/test/track_4a.mp3': TrackData(file_path='/test/track_4a.mp3', mixinkey_data=FakeMixInKey(key='4A')),
+            '/test/track_9b.mp3': TrackData(file_path='/test/track_9b.mp3', mixinkey_data=FakeMixInKey(key='9B')),
+            '/test/no_key.mp3': TrackData(file_path='/test/no_key.mp3')
+        }
+        
+        assert list(analyzer.get_tracks_by_key('4A')) == ['/test/track_4a.mp3']
+        assert analyzer.get_tracks_by_key('1A') == {}
+        
+        # Re-storing a track under a new key moves it between index entries
+        analyzer.tracks_database['/test/track_4a.mp3'] = TrackData(
+            file_path='/test/track_4a.mp3', mixinkey_data=FakeMixInKey(key='9B')
+        )
+        assert analyzer.get_tracks_by_key('4A') == {}
+        assert len(analyzer.get_tracks_by_key('9B')) == 2
+    
     def test_get_tracks_by_bpm_range(self):
         """Test filtering tracks by BPM range."""
         analyzer = TrackAnalyzer()
@@ -232,15 +294,15 @@ class TestTrackAnalyzer:
         # Create test tracks with different BPMs
         track1 = TrackData(
             file_path='/test/track_120.mp3',
-            mixinkey_data=Mock(bpm=120.0)
+            mixinkey_data=FakeMixInKey(bpm=120.0)
         )
         track2 = TrackData(
             file_path='/test/track_130.mp3',
-            mixinkey_data=Mock(bpm=130.0)
+            mixinkey_data=FakeMixInKey(bpm=130.0)
         )
         track3 = TrackData(
             file_path='/test/track_140.mp3',
-            mixinkey_data=Mock(bpm=140.0)
+            mixinkey_data=FakeMixInKey(bpm=140.0)
         )
         
         analyzer.tracks_database = {
@@ -255,6 +317,31 @@ class TestTrackAnalyzer:
         assert len(filtered_tracks) == 1
         assert '/test/track_130.mp3' in filtered_tracks
     
+    def test_queries_follow_database_changes(self):
+        """Test that filters and statistics see tracks added or removed after a query."""
+        analyzer = TrackAnalyzer()
+        analyzer.tracks_database['/test/track_120.mp3'] = TrackData(
+            file_path='/test/track_120.mp3',
+            mixinkey_data=FakeMixInKey(bpm=120.0, key='4A')
+        )
+        assert len(analyzer.get_tracks_by_bpm_range(115.0, 135.0)) == 1
+        
+        analyzer.tracks_database['/test/track_130.mp3'] = TrackData(
+            file_path='/test/track_130.mp3',
+            mixinkey_data=FakeMixInKey(bpm=130.0, key='9B')
+        )
+        assert len(analyzer.get_tracks_by_bpm_range(115.0, 135.0)) == 2
+        
+        del analyzer.tracks_database['/test/track_120.mp3']
+        assert list(analyzer.get_tracks_by_bpm_range(115.0, 135.0)) == ['/test/track_130.mp3']
+        stats = analyzer.get_database_statistics()
+        assert stats['key_distribution'] == {'9B': 1}
+        assert stats['average_bpm'] == 130.0
+        assert stats['bpm_range'] == {'min': 130.0, 'max': 130.0}  # removed track held the minimum
+        
+        analyzer.clear_database()
+        assert analyzer.get_tracks_by_bpm_range(115.0, 135.0) == {}
+    
     def test_get_database_statistics(self):
         """Test database statistics generation."""
         analyzer = TrackAnalyzer()
@@ -262,13 +349,13 @@ class TestTrackAnalyzer:
         # Create test database
         track1 = TrackData(
             file_path='/test/track1.mp3',
-            mixinkey_data=Mock(bpm=128.0, key='4A', analyzed_by_mixinkey=True),
-            genre_classification=Mock(primary_genre='House')
+            mixinkey_data=FakeMixInKey(bpm=128.0, key='4A', analyzed_by_mixinkey=True),
+            genre_classification=FakeGenre(primary_genre='House')
         )
         track2 = TrackData(
             file_path='/test/track2.mp3',
-            mixinkey_data=Mock(bpm=135.0, key='9B', analyzed_by_mixinkey=False),
-            genre_classification=Mock(primary_genre='Techno')
+            mixinkey_data=FakeMixInKey(bpm=135.0, key='9B', analyzed_by_mixinkey=False),
+            genre_classification=FakeGenre(primary_genre='Techno')
         )
         
         analyzer.tracks_database = {
@@ -312,8 +399,8 @@ class TestTrackAnalyzer:
         for i in range(1000):
             track_data = TrackData(
                 file_path=f'/test/track_{i:04d}.mp3',
-                mixinkey_data=Mock(bpm=120.0 + i % 40, key='4A'),
-                genre_classification=Mock(primary_genre='House')
+                mixinkey_data=FakeMixInKey(bpm=120.0 + i % 40, key='4A'),
+                genre_classification=FakeGenre(primary_genre='House')
             )
             analyzer.tracks_database[f'/test/track_{i:04d}.mp3'] = track_data
         
@@ -348,3 +435,13 @@ class TestTrackAnalyzer:
         assert result.energy_level == 0.7  # 7 / 10
         assert result.duration == 240.0
         assert result.success is True
+    
+    @pytest.mark.parametrize("energy,expected", [
+        (None, None), (1, 0.1), (10, 1.0), (12, 1.0), (-3, 0.0)
+    ])
+    def test_create_analysis_result_energy_range(self, energy, expected):
+        """Test that MixInKey energy maps onto the 0.0-1.0 energy_level range."""
+        analyzer = TrackAnalyzer()
+        mixinkey_data = MixInKeyTrackData(file_path='/test/track.mp3', filename='track.mp3', energy=energy)
+    
+        assert analyzer._create_analysis_result(mixinkey_data).energy_level == expected
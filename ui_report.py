@@ -0,0 +1,37 @@
+"""
+UI Report
+=========
+Text measuring and report output shared by the UI check scripts. Qt is only
+imported the first time text is measured, so scripts that never measure
+text do not load it.
+"""
+
+import sys
+from functools import lru_cache
+
+_APP = None
+_FM = None
+
+
+def get_fm():
+    """Return the process-wide default-font QFontMetrics, starting Qt on first use."""
+    global _APP, _FM
+    if _FM is None:
+        from PySide6.QtWidgets import QApplication
+        from PySide6.QtGui import QFontMetrics, QFont
+        
+        _APP = QApplication.instance() or QApplication(sys.argv)
+        _FM = QFontMetrics(QFont())
+    return _FM
+
+
+@lru_cache(maxsize=4096)
+def advance(text):
+    """Memoized horizontalAdvance of text in the default font."""
+    return get_fm().horizontalAdvance(text)
+
+
+def emit(rows):
+    """Write collected report rows to stdout in one call."""
+    if rows:
+        sys.stdout.write("\n".join(rows) + "\n")
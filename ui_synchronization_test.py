@@ -20,14 +20,21 @@ Date: 2025-07-13
 
 import sys
 import os
+import re
 import time
 import threading
 import logging
+from collections import defaultdict
+from functools import lru_cache, partial
 from pathlib import Path
-from typing import Dict, List, Optional, Any, Callable
+from types import MappingProxyType
+from typing import Dict, List, Optional, Any, Callable, Set, Tuple
 import json
 import tempfile
 
+import numpy as np
+from dataclasses import dataclass
+
 # Add src to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
@@ -36,7 +43,10 @@ from PySide6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, 
     QProgressBar, QLabel, QPushButton, QTabWidget
 )
-from PySide6.QtCore import QThread, Signal, QTimer, Qt, QObject
+from PySide6.QtCore import (
+    QThread, Signal, Slot, QTimer, Qt, QObject, QEvent, QEventLoop, QCoreApplication,
+    QElapsedTimer, QMetaObject, QRunnable, QThreadPool
+)
 from PySide6.QtGui import QPixmap
 from PySide6.QtTest import QTest
 
@@ -45,84 +55,492 @@ from ui.main_window import MusicFlowMainWindow, AnalysisWorker
 from core.mixinkey_integration import MixInKeyIntegration
 from core.performance_manager import PerformanceManager
 
+
+@dataclass(slots=True)
+class MonitoredElement:
+    """A registered widget; property names, getters and last values are aligned by index."""
+    widget: QWidget
+    properties: List[str]
+    getters: List[Callable[[], Any]]
+    last_values: List[Any]
+
+
 class UIElementMonitor(QObject):
-    """Monitor for tracking UI element states and changes."""
+    """
+    Monitor for tracking UI element states and changes.
+    
+    Properties are marked dirty when their widget reports a possible change:
+    through a change signal (valueChanged, currentChanged, ...) or, for
+    visibility and enabled state, through Show/Hide/EnabledChange events.
+    check_for_changes re-reads only the dirty properties; it runs once the
+    event loop is idle again, so a burst of signals costs a single read.
+    Properties with neither hook (QLabel.text, QTabWidget.count, ...) are
+    marked dirty by a poll timer instead. Each poll is scheduled from the gaps
+    seen so far between changes of those properties: halfway to the median
+    of the gaps still possible since the last change, so an idle UI is polled
+    rarely and a busy one often.
+    """
     
     element_changed = Signal(str, str, object)  # element_id, property, value
     
+    # Widget signals after which a property may have changed
+    CHANGE_SIGNALS = {
+        'value': ('valueChanged',),
+        'text': ('textChanged', 'valueChanged'),  # QProgressBar text follows its value
+        'currentIndex': ('currentChanged',),
+        'maximum': ('rangeChanged',),
+    }
+    
+    # Widget events after which a property may have changed
+    CHANGE_EVENTS = {
+        'isVisible': (QEvent.Type.Show, QEvent.Type.Hide),
+        'isEnabled': (QEvent.Type.EnabledChange,),
+    }
+    
+    # Poll interval for properties without a change signal or event, used until
+    # changes have been seen; adaptive intervals stay within the min/max
+    POLL_INTERVAL_MS = 50
+    POLL_MIN_MS = 10
+    POLL_MAX_MS = 500
+    
+    # Histogram of gaps between changes of polled properties: bin width and count
+    GAP_BIN_MS = 10
+    GAP_BINS = 256
+    
+    # Number of most recent state changes kept in the history
+    HISTORY_CAPACITY = 65536
+    
+    # One history row per change; timestamps are time.perf_counter_ns() values,
+    # element ids and property names are stored as codes
+    HISTORY_DTYPE = np.dtype([
+        ('timestamp', 'i8'), ('element_id', 'u2'), ('property', 'u2'),
+        ('old_value', 'O'), ('new_value', 'O')
+    ])
+    
+    # Number of get_state_history queries whose rows are kept until the history changes
+    HISTORY_CACHE_SIZE = 256
+    
     def __init__(self):
         super().__init__()
-        self.monitored_elements = {}
-        self.state_history = []
+        self.monitored_elements: Dict[str, MonitoredElement] = {}
         self.logger = logging.getLogger("UIElementMonitor")
+        
+        # Ring buffer of state changes, in timestamp order from _history_count on
+        self._history = np.zeros(self.HISTORY_CAPACITY, dtype=self.HISTORY_DTYPE)
+        self._history_count = 0
+        self._name_codes: Dict[str, int] = {}
+        self._names: List[str] = []
+        
+        # (element_id, time_range) -> matching rows as plain tuples, valid for one history length
+        self._history_cache: Dict[tuple, Tuple[tuple, ...]] = {}
+        self._history_cache_count = 0
+        
+        # widget -> [(element_id, property index, event types)] for eventFilter
+        self._event_hooks: Dict[QObject, List[Tuple[str, int, Tuple[QEvent.Type, ...]]]] = {}
+        # (element_id, property index) pairs that can only be polled
+        self._polled_properties: List[Tuple[str, int]] = []
+        self._polled_keys: Set[Tuple[str, int]] = set()
+        # Change signal connections made by register_element, dropped in teardown
+        self._connections: List[QMetaObject.Connection] = []
+        self._poll_timer = QTimer(self)
+        self._poll_timer.setSingleShot(True)
+        self._poll_timer.timeout.connect(self._poll)
+        self._poll_interval_ms = self.POLL_INTERVAL_MS
+        self._gap_hist = np.zeros(self.GAP_BINS, dtype=np.int64)
+        self._last_polled_change_ns: Optional[int] = None
+        
+        # element_id -> indices of the properties to re-read on the next check_for_changes
+        self._dirty: Dict[str, Set[int]] = defaultdict(set)
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.setInterval(0)
+        self._flush_timer.timeout.connect(self.check_for_changes)
     
     def register_element(self, element_id: str, widget: QWidget, properties: List[str]):
         """Register a UI element for monitoring."""
-        self.monitored_elements[element_id] = {
-            'widget': widget,
-            'properties': properties,
-            'last_state': {}
-        }
+        # Ids and property names end up as dict keys and in comparisons everywhere;
+        # interned, equal names are the same object
+        element_id = sys.intern(element_id)
         
-        # Capture initial state
-        initial_state = {}
+        # Bind each property getter once and capture the initial state with it;
+        # properties the widget lacks, or whose getter fails, are not monitored
+        props = []
+        getters = []
+        initial_values = []
         for prop in properties:
-            if hasattr(widget, prop):
-                initial_state[prop] = getattr(widget, prop)()
+            prop = sys.intern(prop)
+            getter = getattr(widget, prop, None)
+            if getter is None:
+                continue
+            try:
+                initial_values.append(getter())
+            except Exception as e:
+                self.logger.warning(f"Not monitoring property {prop} on {element_id}: {e}")
+                continue
+            props.append(prop)
+            getters.append(getter)
+        
+        self.monitored_elements[element_id] = MonitoredElement(widget, props, getters, initial_values)
+        
+        # Hook every property to the first change signal the widget has, else to
+        # its change events, else leave it to the poll timer
+        for index, prop in enumerate(props):
+            signal = None
+            for signal_name in self.CHANGE_SIGNALS.get(prop, ()):
+                signal = getattr(widget, signal_name, None)
+                if signal is not None:
+                    break
+            
+            if signal is not None:
+                self._connections.append(signal.connect(partial(self._on_change, element_id, index)))
+            elif prop in self.CHANGE_EVENTS:
+                if widget not in self._event_hooks:
+                    self._event_hooks[widget] = []
+                    widget.installEventFilter(self)
+                self._event_hooks[widget].append((element_id, index, self.CHANGE_EVENTS[prop]))
+            else:
+                self._polled_properties.append((element_id, index))
+                self._polled_keys.add((element_id, index))
+        
+        if self._polled_properties and not self._poll_timer.isActive():
+            self._poll_timer.start(self._poll_interval_ms)
         
-        self.monitored_elements[element_id]['last_state'] = initial_state
         self.logger.debug(f"Registered element {element_id} with properties {properties}")
     
-    def check_for_changes(self):
-        """Check all monitored elements for state changes."""
-        current_time = time.time()
+    def eventFilter(self, watched: QObject, event: QEvent) -> bool:
+        """Re-read properties affected by a Show, Hide or EnabledChange event."""
+        hooks = self._event_hooks.get(watched)
+        if hooks:
+            event_type = event.type()
+            for element_id, index, event_types in hooks:
+                if event_type in event_types:
+                    self._on_change(element_id, index)
+        return False
+    
+    def _on_change(self, element_id: str, index: int, *_signal_args):
+        """Mark a property dirty after its widget reported a possible change."""
+        self._dirty[element_id].add(index)
+        if not self._flush_timer.isActive():
+            # Unhooked properties often change together with hooked ones (a status
+            # label set with its progress bar); read them in the same check
+            self._mark_polled_dirty()
+            self._flush_timer.start()
+    
+    def _mark_polled_dirty(self):
+        """Mark every property without a change hook dirty."""
+        for element_id, index in self._polled_properties:
+            self._dirty[element_id].add(index)
+    
+    @Slot()
+    def _poll(self):
+        """Check every property without a change hook, then schedule the next poll."""
+        self._mark_polled_dirty()
+        self.check_for_changes()
+        
+        if self._polled_properties:
+            self._poll_interval_ms = self._next_poll_interval_ms()
+            self._poll_timer.start(self._poll_interval_ms)
+    
+    def _record_polled_change(self, current_time: int):
+        """Add the gap since the previous change of a polled property to the histogram."""
+        if self._last_polled_change_ns is not None:
+            gap_ms = (current_time - self._last_polled_change_ns) / 1e6
+            self._gap_hist[min(self.GAP_BINS - 1, int(gap_ms // self.GAP_BIN_MS))] += 1
+        self._last_polled_change_ns = current_time
+    
+    def _next_poll_interval_ms(self) -> int:
+        """
+        Delay until the next poll, from the gap histogram and the time since the last change.
         
-        for element_id, element_data in self.monitored_elements.items():
-            widget = element_data['widget']
-            properties = element_data['properties']
-            last_state = element_data['last_state']
+        Changes are only seen when polled, so observed gaps stretch to the poll
+        interval; polling halfway to the median remaining gap keeps the
+        estimate from settling on a too-long interval.
+        """
+        if self._last_polled_change_ns is None or not self._gap_hist.any():
+            return self.POLL_INTERVAL_MS
+        
+        elapsed_ms = (time.perf_counter_ns() - self._last_polled_change_ns) / 1e6
+        first_bin = min(self.GAP_BINS - 1, int(elapsed_ms // self.GAP_BIN_MS))
+        remaining = np.cumsum(self._gap_hist[first_bin:])
+        
+        if remaining[-1]:
+            median_bin = first_bin + int(np.searchsorted(remaining, remaining[-1] / 2))
+            interval = ((median_bin + 1) * self.GAP_BIN_MS - elapsed_ms) / 2
+        else:
+            # Quieter than any gap seen so far: back off
+            interval = self._poll_interval_ms * 2
+        
+        return int(min(self.POLL_MAX_MS, max(self.POLL_MIN_MS, interval)))
+    
+    def _refresh_property(self, element_id: str, element: MonitoredElement, index: int,
+                          current_time: int):
+        """
+        Read a property and, if it changed, record it and emit element_changed.
+        
+        Getters were checked at registration; an exception here is a real failure
+        and propagates.
+        """
+        current_value = element.getters[index]()
+        
+        # Check for changes
+        last_value = element.last_values[index]
+        if last_value != current_value:
+            prop = element.properties[index]
             
-            current_state = {}
+            # Update last known state
+            element.last_values[index] = current_value
             
-            for prop in properties:
-                if hasattr(widget, prop):
-                    try:
-                        current_value = getattr(widget, prop)()
-                        current_state[prop] = current_value
-                        
-                        # Check for changes
-                        if prop in last_state and last_state[prop] != current_value:
-                            self.element_changed.emit(element_id, prop, current_value)
-                            
-                            # Record state change
-                            self.state_history.append({
-                                'timestamp': current_time,
-                                'element_id': element_id,
-                                'property': prop,
-                                'old_value': last_state[prop],
-                                'new_value': current_value
-                            })
-                    
-                    except Exception as e:
-                        self.logger.warning(f"Error checking property {prop} on {element_id}: {e}")
+            # Record state change
+            self._history[self._history_count % self.HISTORY_CAPACITY] = (
+                current_time, self._name_code(element_id), self._name_code(prop),
+                last_value, current_value
+            )
+            self._history_count += 1
             
-            # Update last known state
-            element_data['last_state'] = current_state
+            if (element_id, index) in self._polled_keys:
+                self._record_polled_change(current_time)
+            
+            # Notify last, so listeners see the monitor already up to date
+            self.element_changed.emit(element_id, prop, current_value)
     
-    def get_state_history(self, element_id: Optional[str] = None, 
-                         time_range: Optional[tuple] = None) -> List[Dict]:
-        """Get state change history with optional filtering."""
-        filtered_history = self.state_history
+    @Slot()
+    def check_for_changes(self):
+        """Check the properties marked dirty since the last check for changes."""
+        if not self._dirty:
+            return
         
-        if element_id:
-            filtered_history = [h for h in filtered_history if h['element_id'] == element_id]
+        current_time = time.perf_counter_ns()
+        dirty, self._dirty = self._dirty, defaultdict(set)
+        
+        for element_id, indices in dirty.items():
+            element = self.monitored_elements.get(element_id)
+            if element is None:
+                continue
+            for index in indices:
+                self._refresh_property(element_id, element, index, current_time)
+    
+    def last_value(self, element_id: str, prop: str) -> Any:
+        """Last value recorded for a monitored property (None if it is not monitored)."""
+        element = self.monitored_elements.get(element_id)
+        if element is None or prop not in element.properties:
+            return None
+        return element.last_values[element.properties.index(prop)]
+    
+    def stop(self):
+        """Stop polling and drop pending checks; signal and event hooks stay in place."""
+        self._poll_timer.stop()
+        self._flush_timer.stop()
+        self._dirty.clear()
+    
+    def teardown(self):
+        """Stop monitoring and detach from every registered widget."""
+        self.stop()
+        
+        # Widgets may outlive the monitor; leave no dead slots or filters on them
+        for connection in self._connections:
+            QObject.disconnect(connection)
+        self._connections.clear()
+        for widget in self._event_hooks:
+            widget.removeEventFilter(self)
+        self._event_hooks.clear()
+        
+        self._polled_properties.clear()
+        self._polled_keys.clear()
+        self.monitored_elements.clear()
+    
+    def _name_code(self, name: str) -> int:
+        """Code under which an element id or property name is stored in the history."""
+        code = self._name_codes.get(name)
+        if code is None:
+            code = self._name_codes[name] = len(self._names)
+            self._names.append(name)
+        return code
+    
+    def _history_rows(self) -> np.ndarray:
+        """History rows from oldest to newest."""
+        count = self._history_count
+        if count <= self.HISTORY_CAPACITY:
+            return self._history[:count]
+        
+        head = count % self.HISTORY_CAPACITY
+        return np.concatenate((self._history[head:], self._history[:head]))
+    
+    @property
+    def state_history(self) -> List[Dict]:
+        """Recorded state changes, oldest first (built on each access)."""
+        return self.get_state_history()
+    
+    def get_history_array(self, time_range: Optional[tuple] = None) -> np.ndarray:
+        """History rows (HISTORY_DTYPE), oldest first, optionally within a perf_counter_ns range."""
+        rows = self._history_rows()
         
         if time_range:
+            # Rows are appended in time order, so the range is one contiguous slice
             start_time, end_time = time_range
-            filtered_history = [h for h in filtered_history 
-                              if start_time <= h['timestamp'] <= end_time]
+            timestamps = rows['timestamp']
+            rows = rows[np.searchsorted(timestamps, start_time, side='left'):
+                        np.searchsorted(timestamps, end_time, side='right')]
+        
+        return rows
+    
+    def element_mask(self, rows: np.ndarray, element_id: str) -> np.ndarray:
+        """Boolean mask selecting the history rows recorded for element_id."""
+        code = self._name_codes.get(element_id)
+        if code is None:
+            return np.zeros(len(rows), dtype=bool)
+        return rows['element_id'] == code
+    
+    def get_state_history(self, element_id: Optional[str] = None, 
+                         time_range: Optional[tuple] = None) -> List[Dict]:
+        """
+        Get state change history with optional filtering.
         
-        return filtered_history
+        The matching rows are cached until the next change is recorded: the
+        history only grows, so its length identifies its contents. The dicts
+        are built on every call, so callers may modify the result.
+        
+        Returns:
+            Matching changes, oldest first
+        """
+        if self._history_cache_count != self._history_count:
+            self._history_cache.clear()
+            self._history_cache_count = self._history_count
+        
+        key = (element_id, tuple(time_range) if time_range else None)
+        records = self._history_cache.get(key)
+        if records is None:
+            rows = self.get_history_array(time_range)
+            
+            if element_id:
+                rows = rows[self.element_mask(rows, element_id)]
+            
+            records = tuple(rows.tolist())
+            if len(self._history_cache) >= self.HISTORY_CACHE_SIZE:
+                # Dicts keep insertion order, so the first key is the oldest query
+                del self._history_cache[next(iter(self._history_cache))]
+            self._history_cache[key] = records
+        
+        names = self._names
+        return [
+            {
+                'timestamp': timestamp,
+                'element_id': names[element_code],
+                'property': names[property_code],
+                'old_value': old_value,
+                'new_value': new_value
+            }
+            for timestamp, element_code, property_code, old_value, new_value in records
+        ]
+
+class PostponedSignals:
+    """
+    Hold back the change signals of a group of widgets while they are updated.
+    
+    Signals are blocked inside the block; on exit, each widget whose value or
+    text changed emits valueChanged/textChanged once with its final state, so
+    listeners see the whole group already updated.
+    """
+    
+    # Getter and change signal re-emitted on exit, where the widget has them
+    NOTIFIED_PROPERTIES = (('value', 'valueChanged'), ('text', 'textChanged'))
+    
+    def __init__(self, *widgets: Optional[QWidget]):
+        self._widgets = [widget for widget in widgets if widget is not None]
+        self._saved = []
+    
+    def __enter__(self):
+        for widget in self._widgets:
+            notified = [(getattr(widget, getter_name)(), getter_name, getattr(widget, signal_name))
+                        for getter_name, signal_name in self.NOTIFIED_PROPERTIES
+                        if hasattr(widget, getter_name) and hasattr(widget, signal_name)]
+            self._saved.append((widget, widget.blockSignals(True), notified))
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        saved, self._saved = self._saved, []
+        for widget, was_blocked, _ in saved:
+            widget.blockSignals(was_blocked)
+        
+        for widget, was_blocked, notified in saved:
+            if was_blocked:
+                continue
+            for old_value, getter_name, signal in notified:
+                new_value = getattr(widget, getter_name)()
+                if new_value != old_value:
+                    signal.emit(new_value)
+        return False
+
+
+class ComputationalLoad(QRunnable):
+    """
+    Background CPU load for the responsiveness test, run on a QThreadPool.
+    
+    Each round is a BLAS matrix product, which runs with the GIL released, so
+    the load competes for the CPU without simply starving the UI thread.
+    stop() ends the work at the next round.
+    """
+    
+    ROUNDS = 10
+    ROUND_INTERVAL_S = 0.1
+    
+    def __init__(self):
+        super().__init__()
+        # Owned by the caller, which still calls stop() after the run finishes
+        self.setAutoDelete(False)
+        self._stopped = threading.Event()
+    
+    def run(self):
+        matrix = np.random.default_rng(0).random((512, 512))
+        for _ in range(self.ROUNDS):
+            # Simulate heavy computation
+            matrix @ matrix
+            if self._stopped.wait(self.ROUND_INTERVAL_S):
+                break
+    
+    def stop(self):
+        self._stopped.set()
+
+
+# Status wording that indicates activity / completion (substring matches)
+_ACTIVITY_RE = re.compile(r'processing|analyzing|working', re.IGNORECASE)
+_COMPLETE_RE = re.compile(r'complete', re.IGNORECASE)
+
+
+# test_results keys of the sub-tests, in report order
+_TEST_CATEGORIES = (
+    'element_sync',
+    'transition_sync',
+    'realtime_updates',
+    'load_responsiveness',
+    'component_communication',
+    'state_management'
+)
+
+# Report icon per sub-test status (read-only)
+_STATUS_ICONS = MappingProxyType({
+    'PASS': '✅',
+    'FAIL': '❌',
+    'ERROR': '💥',
+    'SKIPPED': '⏭️',
+    'UNKNOWN': '❓'
+})
+
+
+@lru_cache(maxsize=256)
+def _progress_status_issues(progress_value: int, status_text: str) -> Tuple[str, ...]:
+    """Inconsistencies between a progress value and the status text shown with it."""
+    issues = []
+    
+    # If progress shows completion but status doesn't reflect it
+    if progress_value == 100 and not _COMPLETE_RE.search(status_text):
+        issues.append("Progress shows 100% but status doesn't indicate completion")
+    
+    # If progress is 0 but status shows activity
+    if progress_value == 0 and _ACTIVITY_RE.search(status_text):
+        issues.append("Progress is 0% but status indicates activity")
+    
+    return tuple(issues)
+
 
 class UISynchronizationTester:
     """
@@ -130,18 +548,22 @@ class UISynchronizationTester:
     Validates that all UI elements stay synchronized during operations.
     """
     
+    # Changes in the same window of this length count as simultaneous
+    SYNC_WINDOW_NS = 100_000_000  # 100ms
+    
+    # Event processing while timing an interaction: the UI's own events only, at most 5ms
+    RESPONSE_EVENT_FLAGS = (QEventLoop.ProcessEventsFlag.ExcludeUserInputEvents |
+                            QEventLoop.ProcessEventsFlag.ExcludeSocketNotifiers)
+    RESPONSE_EVENT_MAX_MS = 5
+    
+    # Interactions timed per responsiveness measurement
+    RESPONSE_SAMPLES = 10
+    
     def __init__(self):
         self.app = None
         self.main_window = None
         self.monitor = UIElementMonitor()
-        self.test_results = {
-            'element_sync': {},
-            'transition_sync': {},
-            'realtime_updates': {},
-            'load_responsiveness': {},
-            'component_communication': {},
-            'state_management': {}
-        }
+        self.test_results = {category: {} for category in _TEST_CATEGORIES}
         self.logger = logging.getLogger("UISynchronizationTester")
         
         # Create test workspace
@@ -154,6 +576,29 @@ class UISynchronizationTester:
             'progress_update_tolerance': 0.02,  # 2% tolerance for progress synchronization
             'max_freeze_time_ms': 200       # Max UI freeze time under load
         }
+        self._max_update_delay_ns = self.sync_thresholds['max_update_delay_ms'] * 1_000_000
+        
+        # Main window parts used by the tests, resolved once (None when missing)
+        self._progress_bar = None
+        self._status_label = None
+        self._tab_widget = None
+        self._player_widget = None
+        self._on_file_progress = None
+        # (state key, bound getter) pairs read by _capture_ui_state, bound on first use:
+        # notified probes sit behind a change signal that bumps _ui_version, so their
+        # values are re-read only after the version moved; the others every time
+        self._state_probes: Optional[Tuple[Tuple[str, Callable[[], Any]], ...]] = None
+        self._notified_probes: Tuple[Tuple[str, Callable[[], Any]], ...] = ()
+        self._probe_connections: List[QMetaObject.Connection] = []
+        self._ui_version = 0
+        self._notified_state: Dict[str, Any] = {}
+        self._notified_state_version = -1
+        
+        # Response-time samples in ns, reused by every measurement
+        self._rt_buf = np.empty(self.RESPONSE_SAMPLES, dtype=np.int64)
+        
+        # Report lines of the running sub-test, written out when it finishes
+        self._out: List[str] = []
     
     def setup_test_environment(self):
         """Set up the test environment with Qt application."""
@@ -164,41 +609,43 @@ class UISynchronizationTester:
         
         # Initialize main window
         self.main_window = MusicFlowMainWindow()
+        self._progress_bar = getattr(self.main_window, 'progress_bar', None)
+        self._status_label = getattr(self.main_window, 'status_label', None)
+        self._tab_widget = getattr(self.main_window, 'tab_widget', None)
+        self._player_widget = getattr(self.main_window, 'player_widget', None)
+        self._on_file_progress = getattr(self.main_window, 'on_file_progress', None)
+        self._unbind_state_probes()
         
-        # Register critical UI elements for monitoring
+        # Register critical UI elements for monitoring; the monitor follows their
+        # change signals from here on
         self._register_ui_elements()
         
-        # Set up monitoring timer
-        self.monitor_timer = QTimer()
-        self.monitor_timer.timeout.connect(self.monitor.check_for_changes)
-        self.monitor_timer.start(50)  # Check every 50ms
-        
         self.logger.info("UI test environment set up successfully")
     
     def _register_ui_elements(self):
         """Register critical UI elements for synchronization monitoring."""
         try:
             # Main progress bar
-            if hasattr(self.main_window, 'progress_bar'):
+            if self._progress_bar is not None:
                 self.monitor.register_element(
                     'main_progress',
-                    self.main_window.progress_bar,
+                    self._progress_bar,
                     ['value', 'maximum', 'isVisible', 'text']
                 )
             
             # Status label
-            if hasattr(self.main_window, 'status_label'):
+            if self._status_label is not None:
                 self.monitor.register_element(
                     'status_label',
-                    self.main_window.status_label,
+                    self._status_label,
                     ['text', 'isVisible']
                 )
             
             # Tab widget
-            if hasattr(self.main_window, 'tab_widget'):
+            if self._tab_widget is not None:
                 self.monitor.register_element(
                     'main_tabs',
-                    self.main_window.tab_widget,
+                    self._tab_widget,
                     ['currentIndex', 'count']
                 )
             
@@ -211,10 +658,10 @@ class UISynchronizationTester:
                 )
             
             # Player widget if available
-            if hasattr(self.main_window, 'player_widget'):
+            if self._player_widget is not None:
                 self.monitor.register_element(
                     'player_widget',
-                    self.main_window.player_widget,
+                    self._player_widget,
                     ['isVisible', 'isEnabled']
                 )
             
@@ -238,65 +685,84 @@ class UISynchronizationTester:
             print(f"\n1️⃣ ELEMENT SYNCHRONIZATION TESTING")
             print("-" * 50)
             self.test_element_synchronization()
+            self._flush_output()
             
             # Test 2: Window/Tab Transitions (CRÍTICO)
             print(f"\n2️⃣ WINDOW/TAB TRANSITION TESTING")
             print("-" * 50)
             self.test_window_tab_transitions()
+            self._flush_output()
             
             # Test 3: Real-time UI Updates (CRÍTICO)
             print(f"\n3️⃣ REAL-TIME UI UPDATES TESTING")
             print("-" * 50)
             self.test_realtime_ui_updates()
+            self._flush_output()
             
             # Test 4: UI Responsiveness Under Load (ALTO)
             print(f"\n4️⃣ UI RESPONSIVENESS UNDER LOAD")
             print("-" * 50)
             self.test_ui_responsiveness_under_load()
+            self._flush_output()
             
             # Test 5: Component Communication (ALTO)
             print(f"\n5️⃣ COMPONENT COMMUNICATION TESTING")
             print("-" * 50)
             self.test_component_communication()
+            self._flush_output()
             
             # Test 6: State Management (MEDIO)
             print(f"\n6️⃣ STATE MANAGEMENT VALIDATION")
             print("-" * 50)
             self.test_state_management()
+            self._flush_output()
             
             # Generate comprehensive report
             self.generate_ui_sync_report()
             
         except Exception as e:
+            self._flush_output()
             print(f"❌ Critical error in UI synchronization testing: {e}")
             self.test_results['critical_error'] = str(e)
     
+    def _p(self, line: str):
+        """Add a line to the running sub-test's output."""
+        self._out.append(line)
+    
+    def _flush_output(self):
+        """Write the buffered sub-test output in one go."""
+        if self._out:
+            self._out.append('')
+            sys.stdout.write('\n'.join(self._out))
+            self._out.clear()
+            sys.stdout.flush()
+    
     def test_element_synchronization(self):
         """Test 1: Element synchronization during operations."""
         try:
-            print("🔍 Testing UI element synchronization...")
+            self._p("🔍 Testing UI element synchronization...")
             
-            start_time = time.time()
+            start_ns = time.perf_counter_ns()
             
             # Simulate progress updates
             self._simulate_progress_updates()
             
             # Wait for updates to process
-            QTest.qWait(1000)
+            self._wait_until(self._final_progress_recorded)
             
             # Analyze synchronization
-            sync_issues = self._analyze_element_synchronization(start_time)
+            sync_issues = self._analyze_element_synchronization(start_ns)
             
             sync_score = max(0, 100 - len(sync_issues) * 10)  # 10% penalty per issue
             
-            print(f"   📊 Element sync score: {sync_score}%")
+            self._p(f"   📊 Element sync score: {sync_score}%")
             
             if sync_issues:
-                print(f"   ⚠️  Synchronization issues detected:")
+                self._p(f"   ⚠️  Synchronization issues detected:")
                 for issue in sync_issues[:5]:  # Show top 5 issues
-                    print(f"      - {issue}")
+                    self._p(f"      - {issue}")
             else:
-                print(f"   ✅ All elements perfectly synchronized")
+                self._p(f"   ✅ All elements perfectly synchronized")
             
             self.test_results['element_sync'] = {
                 'score': sync_score,
@@ -305,7 +771,7 @@ class UISynchronizationTester:
             }
             
         except Exception as e:
-            print(f"❌ Error in element synchronization test: {e}")
+            self._p(f"❌ Error in element synchronization test: {e}")
             self.test_results['element_sync'] = {
                 'status': 'ERROR',
                 'error': str(e)
@@ -313,91 +779,132 @@ class UISynchronizationTester:
     
     def _simulate_progress_updates(self):
         """Simulate progress bar and status updates."""
+        progress_bar = self._progress_bar
+        status_label = self._status_label
+        
         # Simulate progress from 0 to 100
         for i in range(0, 101, 10):
-            if hasattr(self.main_window, 'progress_bar'):
-                self.main_window.progress_bar.setValue(i)
-            
-            if hasattr(self.main_window, 'status_label'):
-                self.main_window.status_label.setText(f"Processing... {i}%")
+            # Bar and label change as one step: listeners are notified once both are set
+            with PostponedSignals(progress_bar, status_label):
+                if progress_bar is not None:
+                    progress_bar.setValue(i)
+                
+                if status_label is not None:
+                    status_label.setText(f"Processing... {i}%")
             
             QTest.qWait(50)  # Small delay between updates
     
-    def _analyze_element_synchronization(self, start_time: float) -> List[str]:
+    def _final_progress_recorded(self) -> bool:
+        """Whether the monitor has recorded the last step of _simulate_progress_updates."""
+        return ((self._progress_bar is None or
+                 self.monitor.last_value('main_progress', 'value') == 100) and
+                (self._status_label is None or
+                 self.monitor.last_value('status_label', 'text') == "Processing... 100%"))
+    
+    def _wait_until(self, predicate: Callable[[], bool], timeout_ms: int = 1000) -> bool:
+        """
+        Run the event loop until predicate() holds or timeout_ms pass.
+        
+        The predicate is re-checked whenever the monitor records a change, so the
+        wait ends as soon as the UI has converged rather than after a fixed delay.
+        
+        Returns:
+            The predicate's final value
+        """
+        if predicate():
+            return True
+        
+        loop = QEventLoop()
+        timeout = QTimer()
+        timeout.setSingleShot(True)
+        timeout.timeout.connect(loop.quit)
+        
+        def on_change(*_args):
+            if predicate():
+                loop.quit()
+        
+        connection = self.monitor.element_changed.connect(on_change)
+        timeout.start(timeout_ms)
+        try:
+            loop.exec()
+        finally:
+            timeout.stop()
+            QObject.disconnect(connection)
+        
+        return predicate()
+    
+    def _analyze_element_synchronization(self, start_ns: int) -> List[str]:
         """Analyze element synchronization and detect issues."""
         issues = []
         
         # Get state changes during test period
-        state_changes = self.monitor.get_state_history(
-            time_range=(start_time, time.time())
+        state_changes = self.monitor.get_history_array(
+            time_range=(start_ns, time.perf_counter_ns())
         )
+        timestamps = state_changes['timestamp']
+        
+        # Find the 100ms windows in which only one of progress bar and status changed
+        windows = timestamps // self.SYNC_WINDOW_NS
+        progress_windows = np.unique(windows[self.monitor.element_mask(state_changes, 'main_progress')])
+        status_windows = np.unique(windows[self.monitor.element_mask(state_changes, 'status_label')])
         
-        # Group changes by timestamp windows
-        timestamp_groups = {}
-        for change in state_changes:
-            timestamp_window = int(change['timestamp'] * 10) / 10  # 100ms windows
-            if timestamp_window not in timestamp_groups:
-                timestamp_groups[timestamp_window] = []
-            timestamp_groups[timestamp_window].append(change)
-        
-        # Check for synchronization issues
-        for timestamp, changes in timestamp_groups.items():
-            # Check if progress bar and status updates are synchronized
-            progress_changes = [c for c in changes if c['element_id'] == 'main_progress']
-            status_changes = [c for c in changes if c['element_id'] == 'status_label']
-            
-            if progress_changes and not status_changes:
-                issues.append(f"Progress updated without status update at {timestamp}")
-            elif status_changes and not progress_changes:
-                issues.append(f"Status updated without progress update at {timestamp}")
+        unmatched = np.setxor1d(progress_windows, status_windows, assume_unique=True)
+        progress_only = np.isin(unmatched, progress_windows, assume_unique=True)
+        
+        for window, is_progress in zip(unmatched.tolist(), progress_only.tolist()):
+            # Windows are reported by their start, in seconds after the test began
+            offset = max(0, window * self.SYNC_WINDOW_NS - start_ns) / 1e9
+            if is_progress:
+                issues.append(f"Progress updated without status update at +{offset:.1f}s")
+            else:
+                issues.append(f"Status updated without progress update at +{offset:.1f}s")
         
         # Check for delayed updates
-        if state_changes:
-            first_change = min(state_changes, key=lambda x: x['timestamp'])
-            last_change = max(state_changes, key=lambda x: x['timestamp'])
-            
-            total_duration = (last_change['timestamp'] - first_change['timestamp']) * 1000
+        if len(timestamps):
+            total_duration_ns = int(timestamps[-1] - timestamps[0])
             
-            if total_duration > self.sync_thresholds['max_update_delay_ms'] * 10:
-                issues.append(f"UI updates took {total_duration:.1f}ms (too slow)")
+            if total_duration_ns > self._max_update_delay_ns * 10:
+                issues.append(f"UI updates took {total_duration_ns / 1e6:.1f}ms (too slow)")
         
         return issues
     
     def test_window_tab_transitions(self):
         """Test 2: Window and tab transition smoothness."""
         try:
-            print("🔍 Testing window/tab transitions...")
+            self._p("🔍 Testing window/tab transitions...")
             
-            transition_times = []
+            transition_ns = np.empty(0, dtype=np.int64)
             
             # Test tab switching if tab widget exists
-            if hasattr(self.main_window, 'tab_widget') and self.main_window.tab_widget.count() > 1:
-                for i in range(self.main_window.tab_widget.count()):
-                    start_time = time.time()
+            tab_widget = self._tab_widget
+            if tab_widget is not None and tab_widget.count() > 1:
+                transition_ns = np.empty(tab_widget.count(), dtype=np.int64)
+                timer = QElapsedTimer()
+                timer.start()
+                for i in range(len(transition_ns)):
+                    timer.restart()
                     
                     # Switch to tab
-                    self.main_window.tab_widget.setCurrentIndex(i)
+                    tab_widget.setCurrentIndex(i)
                     QTest.qWait(100)  # Wait for transition
                     
-                    end_time = time.time()
-                    transition_time = (end_time - start_time) * 1000
-                    transition_times.append(transition_time)
+                    transition_ns[i] = timer.nsecsElapsed()
                     
-                    print(f"      Tab {i} transition: {transition_time:.1f}ms")
+                    self._p(f"      Tab {i} transition: {transition_ns[i] / 1e6:.1f}ms")
             
             # Analyze transition performance
-            if transition_times:
-                avg_transition_time = sum(transition_times) / len(transition_times)
-                max_transition_time = max(transition_times)
+            if transition_ns.size:
+                transition_times = transition_ns / 1e6
+                avg_transition_time = float(transition_times.mean())
+                max_transition_time = float(transition_times.max())
                 
-                transitions_fast = all(t <= self.sync_thresholds['max_transition_time_ms'] 
-                                     for t in transition_times)
+                transitions_fast = bool(max_transition_time <= self.sync_thresholds['max_transition_time_ms'])
                 
-                print(f"   📊 Average transition time: {avg_transition_time:.1f}ms")
-                print(f"   📊 Maximum transition time: {max_transition_time:.1f}ms")
+                self._p(f"   📊 Average transition time: {avg_transition_time:.1f}ms")
+                self._p(f"   📊 Maximum transition time: {max_transition_time:.1f}ms")
                 
                 status = "✅ PASS" if transitions_fast else "❌ FAIL"
-                print(f"   {status} Transition performance")
+                self._p(f"   {status} Transition performance")
                 
                 self.test_results['transition_sync'] = {
                     'average_time_ms': avg_transition_time,
@@ -406,11 +913,11 @@ class UISynchronizationTester:
                     'status': 'PASS' if transitions_fast else 'FAIL'
                 }
             else:
-                print("   ⏭️  No tabs available for testing")
+                self._p("   ⏭️  No tabs available for testing")
                 self.test_results['transition_sync'] = {'status': 'SKIPPED'}
             
         except Exception as e:
-            print(f"❌ Error in transition testing: {e}")
+            self._p(f"❌ Error in transition testing: {e}")
             self.test_results['transition_sync'] = {
                 'status': 'ERROR',
                 'error': str(e)
@@ -419,10 +926,12 @@ class UISynchronizationTester:
     def test_realtime_ui_updates(self):
         """Test 3: Real-time UI update synchronization."""
         try:
-            print("🔍 Testing real-time UI updates...")
+            self._p("🔍 Testing real-time UI updates...")
             
             # Create a mock analysis worker to test real-time updates
-            test_files = [f"test_file_{i}.mp3" for i in range(20)]
+            test_files = tuple(f"test_file_{i}.mp3" for i in range(20))
+            total_files = len(test_files)
+            on_file_progress = self._on_file_progress
             
             update_timings = []
             update_count = 0
@@ -439,8 +948,8 @@ class UISynchronizationTester:
                 try:
                     # Mock some progress updates
                     for i, filename in enumerate(test_files):
-                        if hasattr(self.main_window, 'on_file_progress'):
-                            self.main_window.on_file_progress(i, len(test_files), filename)
+                        if on_file_progress is not None:
+                            on_file_progress(i, total_files, filename)
                         
                         track_update_timing()
                         QTest.qWait(25)  # 25ms between updates
@@ -464,12 +973,12 @@ class UISynchronizationTester:
                 # Check for consistent timing (should be around 25ms)
                 timing_consistent = all(20 <= diff <= 100 for diff in time_diffs)
                 
-                print(f"   📊 Average update interval: {avg_update_interval:.1f}ms")
-                print(f"   📊 Update interval range: {min_update_interval:.1f}ms - {max_update_interval:.1f}ms")
-                print(f"   📊 Total updates processed: {update_count}")
+                self._p(f"   📊 Average update interval: {avg_update_interval:.1f}ms")
+                self._p(f"   📊 Update interval range: {min_update_interval:.1f}ms - {max_update_interval:.1f}ms")
+                self._p(f"   📊 Total updates processed: {update_count}")
                 
                 status = "✅ PASS" if timing_consistent and progress_signal_connected else "❌ FAIL"
-                print(f"   {status} Real-time update synchronization")
+                self._p(f"   {status} Real-time update synchronization")
                 
                 self.test_results['realtime_updates'] = {
                     'avg_interval_ms': avg_update_interval,
@@ -479,11 +988,11 @@ class UISynchronizationTester:
                     'status': 'PASS' if timing_consistent and progress_signal_connected else 'FAIL'
                 }
             else:
-                print("   ⚠️  Insufficient update data for analysis")
+                self._p("   ⚠️  Insufficient update data for analysis")
                 self.test_results['realtime_updates'] = {'status': 'INSUFFICIENT_DATA'}
             
         except Exception as e:
-            print(f"❌ Error in real-time updates test: {e}")
+            self._p(f"❌ Error in real-time updates test: {e}")
             self.test_results['realtime_updates'] = {
                 'status': 'ERROR',
                 'error': str(e)
@@ -492,102 +1001,127 @@ class UISynchronizationTester:
     def test_ui_responsiveness_under_load(self):
         """Test 4: UI responsiveness under computational load."""
         try:
-            print("🔍 Testing UI responsiveness under load...")
+            self._p("🔍 Testing UI responsiveness under load...")
             
-            # Measure baseline UI responsiveness
-            baseline_response_times = self._measure_ui_response_times()
+            # Measure baseline UI responsiveness (summarized now: the next measurement
+            # reuses the sample buffer)
+            baseline = self._response_time_stats(self._measure_ui_response_times())
             
             # Create computational load in background
-            load_thread = threading.Thread(target=self._create_computational_load)
-            load_thread.daemon = True
-            load_thread.start()
+            load = ComputationalLoad()
+            pool = QThreadPool.globalInstance()
+            pool.start(load)
             
-            QTest.qWait(500)  # Let load stabilize
-            
-            # Measure UI responsiveness under load
-            load_response_times = self._measure_ui_response_times()
+            try:
+                QTest.qWait(500)  # Let load stabilize
+                
+                # Measure UI responsiveness under load
+                under_load = self._response_time_stats(self._measure_ui_response_times())
+            finally:
+                # Later tests must not be timed against a still-running load
+                load.stop()
+                pool.waitForDone(1000)
             
             # Calculate performance degradation
-            if baseline_response_times and load_response_times:
-                baseline_avg = sum(baseline_response_times) / len(baseline_response_times)
-                load_avg = sum(load_response_times) / len(load_response_times)
+            if baseline and under_load:
+                baseline_avg = baseline['avg_ms']
+                load_avg = under_load['avg_ms']
                 
                 performance_degradation = ((load_avg - baseline_avg) / baseline_avg) * 100
-                ui_freeze_detected = any(t > self.sync_thresholds['max_freeze_time_ms'] 
-                                       for t in load_response_times)
+                ui_freeze_detected = under_load['max_ms'] > self.sync_thresholds['max_freeze_time_ms']
                 
-                print(f"   📊 Baseline response time: {baseline_avg:.1f}ms")
-                print(f"   📊 Under-load response time: {load_avg:.1f}ms")
-                print(f"   📊 Performance degradation: {performance_degradation:.1f}%")
+                self._p(f"   📊 Baseline response time: {baseline_avg:.1f}ms (p95 {baseline['p95_ms']:.1f}ms)")
+                self._p(f"   📊 Under-load response time: {load_avg:.1f}ms (p95 {under_load['p95_ms']:.1f}ms)")
+                self._p(f"   📊 Performance degradation: {performance_degradation:.1f}%")
                 
                 responsive_under_load = (performance_degradation < 50 and not ui_freeze_detected)
                 
                 status = "✅ PASS" if responsive_under_load else "❌ FAIL"
-                print(f"   {status} UI responsiveness under load")
+                self._p(f"   {status} UI responsiveness under load")
                 
                 if ui_freeze_detected:
-                    print(f"   ⚠️  UI freeze detected!")
+                    self._p(f"   ⚠️  UI freeze detected!")
                 
                 self.test_results['load_responsiveness'] = {
                     'baseline_avg_ms': baseline_avg,
                     'load_avg_ms': load_avg,
+                    'baseline_p95_ms': baseline['p95_ms'],
+                    'load_p95_ms': under_load['p95_ms'],
                     'performance_degradation_percent': performance_degradation,
                     'ui_freeze_detected': ui_freeze_detected,
                     'responsive_under_load': responsive_under_load,
                     'status': 'PASS' if responsive_under_load else 'FAIL'
                 }
             else:
-                print("   ❌ Could not measure UI response times")
+                self._p("   ❌ Could not measure UI response times")
                 self.test_results['load_responsiveness'] = {'status': 'ERROR'}
             
         except Exception as e:
-            print(f"❌ Error in load responsiveness test: {e}")
+            self._p(f"❌ Error in load responsiveness test: {e}")
             self.test_results['load_responsiveness'] = {
                 'status': 'ERROR',
                 'error': str(e)
             }
     
-    def _measure_ui_response_times(self) -> List[float]:
-        """Measure UI response times by simulating user interactions."""
-        response_times = []
+    def _measure_ui_response_times(self) -> np.ndarray:
+        """
+        Measure UI response times by simulating user interactions.
+        
+        Returns:
+            int64 nanosecond samples, a view of a buffer the next call overwrites
+        """
+        response_times = self._rt_buf
+        measured = 0
         
         try:
+            tab_widget = self._tab_widget
+            timer = QElapsedTimer()
+            timer.start()
+            
             # Test button clicks, tab switches, etc.
-            for _ in range(10):
-                start_time = time.time()
+            for _ in range(len(response_times)):
+                timer.restart()
                 
                 # Simulate UI interaction
-                if hasattr(self.main_window, 'tab_widget') and self.main_window.tab_widget.count() > 1:
-                    current_tab = self.main_window.tab_widget.currentIndex()
-                    next_tab = (current_tab + 1) % self.main_window.tab_widget.count()
-                    self.main_window.tab_widget.setCurrentIndex(next_tab)
+                if tab_widget is not None and tab_widget.count() > 1:
+                    current_tab = tab_widget.currentIndex()
+                    next_tab = (current_tab + 1) % tab_widget.count()
+                    tab_widget.setCurrentIndex(next_tab)
                 
-                # Process events
-                QApplication.processEvents()
+                # Process the events the interaction posted (layout, paint, ...)
+                QCoreApplication.sendPostedEvents(None, 0)
+                QApplication.processEvents(self.RESPONSE_EVENT_FLAGS, self.RESPONSE_EVENT_MAX_MS)
                 
-                end_time = time.time()
-                response_time = (end_time - start_time) * 1000
-                response_times.append(response_time)
+                response_times[measured] = timer.nsecsElapsed()
+                measured += 1
                 
                 QTest.qWait(20)  # Small delay between tests
                 
         except Exception as e:
             self.logger.warning(f"Error measuring UI response times: {e}")
         
-        return response_times
+        return response_times[:measured]
     
-    def _create_computational_load(self):
-        """Create computational load to test UI responsiveness."""
-        # CPU-intensive task
-        for _ in range(10):
-            # Simulate heavy computation
-            sum(i * i for i in range(100000))
-            time.sleep(0.1)
+    @staticmethod
+    def _response_time_stats(samples_ns: np.ndarray) -> Dict[str, float]:
+        """Mean, percentiles and maximum of response-time samples, in ms ({} if none)."""
+        if not samples_ns.size:
+            return {}
+        
+        samples_ms = samples_ns / 1e6
+        p50, p95, p99, maximum = np.percentile(samples_ms, [50, 95, 99, 100]).tolist()
+        return {
+            'avg_ms': float(samples_ms.mean()),
+            'p50_ms': p50,
+            'p95_ms': p95,
+            'p99_ms': p99,
+            'max_ms': maximum
+        }
     
     def test_component_communication(self):
         """Test 5: Inter-component communication and signal synchronization."""
         try:
-            print("🔍 Testing component communication...")
+            self._p("🔍 Testing component communication...")
             
             communication_tests = []
             
@@ -619,9 +1153,9 @@ class UISynchronizationTester:
             
             try:
                 # Test if progress updates propagate correctly
-                if hasattr(self.main_window, 'progress_bar') and hasattr(self.main_window, 'status_label'):
+                if self._progress_bar is not None and self._status_label is not None:
                     # Simulate linked updates
-                    self.main_window.progress_bar.setValue(50)
+                    self._progress_bar.setValue(50)
                     QApplication.processEvents()
                     
                     # Check if other UI elements can respond
@@ -645,13 +1179,13 @@ class UISynchronizationTester:
             
             communication_score = (passed_tests / total_tests * 100) if total_tests > 0 else 0
             
-            print(f"   📊 Component communication score: {communication_score:.1f}%")
+            self._p(f"   📊 Component communication score: {communication_score:.1f}%")
             
             for test in communication_tests:
                 status = "✅" if test['result'] else "❌"
-                print(f"      {status} {test['test']}")
+                self._p(f"      {status} {test['test']}")
                 if 'error' in test:
-                    print(f"         Error: {test['error']}")
+                    self._p(f"         Error: {test['error']}")
             
             self.test_results['component_communication'] = {
                 'score': communication_score,
@@ -660,7 +1194,7 @@ class UISynchronizationTester:
             }
             
         except Exception as e:
-            print(f"❌ Error in component communication test: {e}")
+            self._p(f"❌ Error in component communication test: {e}")
             self.test_results['component_communication'] = {
                 'status': 'ERROR',
                 'error': str(e)
@@ -669,7 +1203,7 @@ class UISynchronizationTester:
     def test_state_management(self):
         """Test 6: State management and UI consistency."""
         try:
-            print("🔍 Testing state management...")
+            self._p("🔍 Testing state management...")
             
             state_tests = []
             
@@ -716,13 +1250,13 @@ class UISynchronizationTester:
             passed_tests = sum(1 for test in state_tests if test['result'])
             overall_score = (passed_tests / total_tests * 100) if total_tests > 0 else 0
             
-            print(f"   📊 State management score: {overall_score:.1f}%")
-            print(f"   📊 State consistency score: {consistency_score:.1f}%")
+            self._p(f"   📊 State management score: {overall_score:.1f}%")
+            self._p(f"   📊 State consistency score: {consistency_score:.1f}%")
             
             if state_consistency_issues:
-                print(f"   ⚠️  State consistency issues:")
+                self._p(f"   ⚠️  State consistency issues:")
                 for issue in state_consistency_issues[:3]:
-                    print(f"      - {issue}")
+                    self._p(f"      - {issue}")
             
             self.test_results['state_management'] = {
                 'overall_score': overall_score,
@@ -733,60 +1267,102 @@ class UISynchronizationTester:
             }
             
         except Exception as e:
-            print(f"❌ Error in state management test: {e}")
+            self._p(f"❌ Error in state management test: {e}")
             self.test_results['state_management'] = {
                 'status': 'ERROR',
                 'error': str(e)
             }
     
+    def _bind_state_probes(self):
+        """Bind the getters _capture_ui_state reads, for the widgets the window has."""
+        # Main window state
+        probes = [
+            ('window_geometry', self.main_window.geometry),
+            ('window_visible', self.main_window.isVisible),
+        ]
+        notified = []
+        
+        # Tab state
+        if self._tab_widget is not None:
+            notified.append(('current_tab', self._tab_widget.currentIndex))
+            self._probe_connections.append(self._tab_widget.currentChanged.connect(self._bump_ui_version))
+            probes.append(('tab_count', self._tab_widget.count))
+        
+        # Progress state
+        if self._progress_bar is not None:
+            notified.append(('progress_value', self._progress_bar.value))
+            self._probe_connections.append(self._progress_bar.valueChanged.connect(self._bump_ui_version))
+            probes.append(('progress_visible', self._progress_bar.isVisible))
+        
+        # Status state (QLabel has no change signal)
+        if self._status_label is not None:
+            probes.append(('status_text', self._status_label.text))
+        
+        self._state_probes = tuple(probes)
+        self._notified_probes = tuple(notified)
+        self._notified_state_version = -1
+    
+    def _unbind_state_probes(self):
+        """Forget the bound state getters and disconnect their change signals."""
+        for connection in self._probe_connections:
+            QObject.disconnect(connection)
+        self._probe_connections.clear()
+        self._state_probes = None
+        self._notified_probes = ()
+        self._notified_state_version = -1
+    
+    def _bump_ui_version(self, *_signal_args):
+        """Note that a notified state value may have changed."""
+        self._ui_version += 1
+    
     def _capture_ui_state(self) -> Dict[str, Any]:
         """Capture current UI state for comparison."""
-        state = {}
+        if self._state_probes is None:
+            self._bind_state_probes()
         
-        try:
-            # Capture main window state
-            state['window_geometry'] = self.main_window.geometry()
-            state['window_visible'] = self.main_window.isVisible()
-            
-            # Capture tab state
-            if hasattr(self.main_window, 'tab_widget'):
-                state['current_tab'] = self.main_window.tab_widget.currentIndex()
-                state['tab_count'] = self.main_window.tab_widget.count()
-            
-            # Capture progress state
-            if hasattr(self.main_window, 'progress_bar'):
-                state['progress_value'] = self.main_window.progress_bar.value()
-                state['progress_visible'] = self.main_window.progress_bar.isVisible()
-            
-            # Capture status state
-            if hasattr(self.main_window, 'status_label'):
-                state['status_text'] = self.main_window.status_label.text()
-            
-        except Exception as e:
-            self.logger.warning(f"Error capturing UI state: {e}")
+        if self._notified_state_version != self._ui_version:
+            version = self._ui_version
+            self._notified_state = self._read_state_probes(self._notified_probes)
+            self._notified_state_version = version
         
+        state = dict(self._notified_state)
+        state.update(self._read_state_probes(self._state_probes))
         return state
     
+    def _read_state_probes(self, probes: Tuple[Tuple[str, Callable[[], Any]], ...]) -> Dict[str, Any]:
+        """Call each probe; values whose widget is already deleted are left out."""
+        values = {}
+        for key, probe in probes:
+            try:
+                values[key] = probe()
+            except RuntimeError as e:
+                # Raised by PySide once the underlying C++ widget is gone
+                self.logger.warning(f"Error capturing UI state {key}: {e}")
+        return values
+    
     def _simulate_state_changes(self):
         """Simulate various UI state changes."""
+        tab_widget = self._tab_widget
+        
         try:
             # Change tab if possible
-            if hasattr(self.main_window, 'tab_widget') and self.main_window.tab_widget.count() > 1:
-                self.main_window.tab_widget.setCurrentIndex(1)
+            if tab_widget is not None and tab_widget.count() > 1:
+                tab_widget.setCurrentIndex(1)
             
             # Update progress
-            if hasattr(self.main_window, 'progress_bar'):
-                self.main_window.progress_bar.setValue(75)
+            if self._progress_bar is not None:
+                self._progress_bar.setValue(75)
             
             # Update status
-            if hasattr(self.main_window, 'status_label'):
-                self.main_window.status_label.setText("Test state change")
-            
-            QApplication.processEvents()
-            QTest.qWait(100)
+            if self._status_label is not None:
+                self._status_label.setText("Test state change")
             
-        except Exception as e:
+        except RuntimeError as e:
+            # A widget was deleted while the window was being torn down
             self.logger.warning(f"Error simulating state changes: {e}")
+        
+        QApplication.processEvents()
+        QTest.qWait(100)
     
     def _check_state_consistency(self, state: Dict[str, Any]) -> List[str]:
         """Check for state consistency issues."""
@@ -795,17 +1371,7 @@ class UISynchronizationTester:
         try:
             # Check if progress and status are consistent
             if 'progress_value' in state and 'status_text' in state:
-                progress_value = state['progress_value']
-                status_text = state['status_text']
-                
-                # If progress shows completion but status doesn't reflect it
-                if progress_value == 100 and 'complete' not in status_text.lower():
-                    issues.append("Progress shows 100% but status doesn't indicate completion")
-                
-                # If progress is 0 but status shows activity
-                if progress_value == 0 and any(word in status_text.lower() 
-                                             for word in ['processing', 'analyzing', 'working']):
-                    issues.append("Progress is 0% but status indicates activity")
+                issues.extend(_progress_status_issues(state['progress_value'], state['status_text']))
             
             # Check tab consistency
             if 'current_tab' in state and 'tab_count' in state:
@@ -819,28 +1385,24 @@ class UISynchronizationTester:
     
     def generate_ui_sync_report(self):
         """Generate comprehensive UI synchronization report."""
-        print(f"\n📋 UI SYNCHRONIZATION & INTEGRATION REPORT")
-        print("=" * 60)
+        # Report lines, written out in one go at the end
+        out = []
+        out.append(f"\n📋 UI SYNCHRONIZATION & INTEGRATION REPORT")
+        out.append("=" * 60)
         
-        # Count passed/failed tests
-        test_categories = [
-            'element_sync',
-            'transition_sync', 
-            'realtime_updates',
-            'load_responsiveness',
-            'component_communication',
-            'state_management'
-        ]
+        # Look each category's result and status up once, for the summary and the details
+        resolved = []
+        for category in _TEST_CATEGORIES:
+            result = self.test_results.get(category, {})
+            resolved.append((category, result, result.get('status', 'UNKNOWN')))
         
+        # Count passed/failed tests
         passed_tests = 0
         total_tests = 0
         critical_issues = []
         
-        for category in test_categories:
-            result = self.test_results.get(category, {})
-            status = result.get('status', 'UNKNOWN')
-            
-            if status in ['PASS', 'FAIL']:
+        for category, result, status in resolved:
+            if status in ('PASS', 'FAIL'):
                 total_tests += 1
                 if status == 'PASS':
                     passed_tests += 1
@@ -849,72 +1411,65 @@ class UISynchronizationTester:
         
         success_rate = (passed_tests / total_tests * 100) if total_tests > 0 else 0
         
-        print(f"\n🎯 UI SYNCHRONIZATION SUMMARY:")
-        print(f"   Tests Passed: {passed_tests}/{total_tests} ({success_rate:.1f}%)")
+        out.append(f"\n🎯 UI SYNCHRONIZATION SUMMARY:")
+        out.append(f"   Tests Passed: {passed_tests}/{total_tests} ({success_rate:.1f}%)")
         
         # Detailed results
-        for category in test_categories:
-            result = self.test_results.get(category, {})
-            status = result.get('status', 'UNKNOWN')
-            
-            status_icon = {
-                'PASS': '✅',
-                'FAIL': '❌', 
-                'ERROR': '💥',
-                'SKIPPED': '⏭️',
-                'UNKNOWN': '❓'
-            }.get(status, '❓')
-            
-            print(f"\n📊 {category.upper().replace('_', ' ')}:")
-            print(f"   {status_icon} Status: {status}")
+        status_icon = _STATUS_ICONS.get
+        for category, result, status in resolved:
+            out.append(f"\n📊 {category.upper().replace('_', ' ')}:")
+            out.append(f"   {status_icon(status, '❓')} Status: {status}")
             
             # Add specific metrics
             if 'score' in result:
-                print(f"   📈 Score: {result['score']:.1f}%")
+                out.append(f"   📈 Score: {result['score']:.1f}%")
             
             if category == 'transition_sync' and 'average_time_ms' in result:
-                print(f"   ⏱️  Average transition: {result['average_time_ms']:.1f}ms")
+                out.append(f"   ⏱️  Average transition: {result['average_time_ms']:.1f}ms")
             
             if category == 'load_responsiveness' and 'performance_degradation_percent' in result:
                 degradation = result['performance_degradation_percent']
-                print(f"   📉 Performance degradation: {degradation:.1f}%")
+                out.append(f"   📉 Performance degradation: {degradation:.1f}%")
             
             if 'issues' in result and result['issues']:
-                print(f"   ⚠️  Issues detected: {len(result['issues'])}")
+                out.append(f"   ⚠️  Issues detected: {len(result['issues'])}")
         
         # UI synchronization verdict
-        print(f"\n🏆 OVERALL UI SYNCHRONIZATION VERDICT:")
+        out.append(f"\n🏆 OVERALL UI SYNCHRONIZATION VERDICT:")
         
         if success_rate >= 90:
-            print("   🥇 EXCELLENT: UI perfectamente sincronizada para uso profesional")
+            out.append("   🥇 EXCELLENT: UI perfectamente sincronizada para uso profesional")
             verdict = "EXCELLENT"
         elif success_rate >= 75:
-            print("   🥈 GOOD: UI bien sincronizada con mejoras menores necesarias")
+            out.append("   🥈 GOOD: UI bien sincronizada con mejoras menores necesarias")
             verdict = "GOOD"
         elif success_rate >= 60:
-            print("   🥉 FAIR: Sincronización aceptable pero necesita optimizaciones")
+            out.append("   🥉 FAIR: Sincronización aceptable pero necesita optimizaciones")
             verdict = "FAIR"
         else:
-            print("   💥 POOR: Problemas críticos de sincronización detectados")
+            out.append("   💥 POOR: Problemas críticos de sincronización detectados")
             verdict = "POOR"
         
         # Recommendations
-        print(f"\n💡 RECOMENDACIONES PRIORITARIAS:")
+        out.append(f"\n💡 RECOMENDACIONES PRIORITARIAS:")
         
         if verdict == "EXCELLENT":
-            print("   - UI excelentemente sincronizada para uso profesional")
-            print("   - Mantener monitoreo de rendimiento en producción")
+            out.append("   - UI excelentemente sincronizada para uso profesional")
+            out.append("   - Mantener monitoreo de rendimiento en producción")
         else:
             if 'element_sync' in critical_issues:
-                print("   🔥 CRÍTICO: Corregir problemas de sincronización de elementos")
+                out.append("   🔥 CRÍTICO: Corregir problemas de sincronización de elementos")
             if 'realtime_updates' in critical_issues:
-                print("   🔥 CRÍTICO: Optimizar actualizaciones en tiempo real")
+                out.append("   🔥 CRÍTICO: Optimizar actualizaciones en tiempo real")
             if 'load_responsiveness' in critical_issues:
-                print("   🔥 CRÍTICO: Mejorar respuesta de UI bajo carga")
+                out.append("   🔥 CRÍTICO: Mejorar respuesta de UI bajo carga")
             if 'component_communication' in critical_issues:
-                print("   ⚠️  Revisar comunicación entre componentes")
+                out.append("   ⚠️  Revisar comunicación entre componentes")
             if 'state_management' in critical_issues:
-                print("   ⚠️  Optimizar gestión de estado de UI")
+                out.append("   ⚠️  Optimizar gestión de estado de UI")
+        
+        sys.stdout.write("\n".join(out) + "\n")
+        sys.stdout.flush()
         
         return {
             'success_rate': success_rate,
@@ -927,9 +1482,9 @@ class UISynchronizationTester:
     def cleanup(self):
         """Clean up test environment."""
         try:
-            if self.monitor_timer:
-                self.monitor_timer.stop()
+            self.monitor.teardown()
             
+            self._unbind_state_probes()
             if self.main_window:
                 self.main_window.close()
             